@@ -0,0 +1,134 @@
+"""Generation of synthetic packages to benchmark wrapping on"""
+import importlib
+import os
+import sys
+import types
+
+
+def _make_module(name, source):
+    module = types.ModuleType(name)
+    module.__file__ = f'<{name}>'
+    sys.modules[name] = module
+    exec(compile(source, module.__file__, 'exec'), module.__dict__)
+    return module
+
+
+def _module_source(n_classes, n_functions, n_methods, n_async_functions=0, n_generators=0):
+    lines = []
+    for function_index in range(n_functions):
+        lines += [
+            f'def function_{function_index}(a, b=1):',
+            f'    return a + b',
+            '',
+        ]
+    for function_index in range(n_generators):
+        lines += [
+            f'def generator_{function_index}(n):',
+            f'    for i in range(n):',
+            f'        yield i',
+            '',
+        ]
+    for function_index in range(n_async_functions):
+        lines += [
+            f'async def async_function_{function_index}(a, b=1):',
+            f'    return a + b',
+            '',
+            f'async def async_generator_{function_index}(n):',
+            f'    for i in range(n):',
+            f'        yield i',
+            '',
+        ]
+    for class_index in range(n_classes):
+        lines += [
+            f'class Class{class_index}:',
+            f'    attribute = {class_index}',
+            '',
+            f'    def __init__(self, value=0):',
+            f'        self.value = value',
+            '',
+        ]
+        for method_index in range(n_methods):
+            lines += [
+                f'    def method_{method_index}(self, a=1):',
+                f'        return self.value + a',
+                '',
+            ]
+    return '\n'.join(lines)
+
+
+def make_package(name='synthetic_package', n_modules=10, n_classes=10, n_functions=10, n_methods=10,
+                 n_async_functions=0, n_generators=0):
+    """
+    Create package with `n_modules` submodules, each containing `n_classes` classes with `n_methods` methods,
+    `n_functions` functions, `n_async_functions` coroutine functions and async generator functions and `n_generators`
+    generator functions, and register it in `sys.modules`
+
+    :return: Package module
+    """
+    for module_name in [module_name for module_name in sys.modules
+                        if module_name == name or module_name.startswith(f'{name}.')]:
+        del sys.modules[module_name]
+    package = _make_module(name=name, source=_module_source(n_classes=n_classes,
+                                                            n_functions=n_functions,
+                                                            n_methods=n_methods,
+                                                            n_async_functions=n_async_functions,
+                                                            n_generators=n_generators))
+    package.__path__ = []
+    for module_index in range(n_modules):
+        submodule_name = f'module_{module_index}'
+        submodule = _make_module(name=f'{name}.{submodule_name}',
+                                 source=_module_source(n_classes=n_classes,
+                                                       n_functions=n_functions,
+                                                       n_methods=n_methods,
+                                                       n_async_functions=n_async_functions,
+                                                       n_generators=n_generators))
+        setattr(package, submodule_name, submodule)
+    return package
+
+
+_LAZY_PACKAGE_INIT = '''import importlib
+import time
+
+_SUBMODULE_NAMES = {submodule_names!r}
+
+
+def __getattr__(name):
+    if name in _SUBMODULE_NAMES:
+        # Stands for slow storage
+        time.sleep({io_latency_s!r})
+        return importlib.import_module(f'{{__name__}}.{{name}}')
+    raise AttributeError(f'module {{__name__!r}} has no attribute {{name!r}}')
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_SUBMODULE_NAMES))
+'''
+
+
+def write_lazy_package(path, name='synthetic_lazy_package', n_packages=10, n_modules=10, n_classes=10,
+                       n_functions=10, n_methods=10, io_latency_s=0.0):
+    """
+    Write package with `n_packages` subpackages to `path`, each subpackage imports its `n_modules` submodules on
+    first attribute access (sleeping for `io_latency_s` first), submodules are like in `make_package`
+
+    :return: Package module, imported from `path`
+    """
+    package_path = os.path.join(path, name)
+    os.makedirs(package_path)
+    subpackage_names = [f'package_{package_index}' for package_index in range(n_packages)]
+    with open(os.path.join(package_path, '__init__.py'), 'w') as file:
+        file.write(''.join(f'from . import {subpackage_name}\n' for subpackage_name in subpackage_names))
+    submodule_names = [f'module_{module_index}' for module_index in range(n_modules)]
+    for subpackage_name in subpackage_names:
+        subpackage_path = os.path.join(package_path, subpackage_name)
+        os.makedirs(subpackage_path)
+        with open(os.path.join(subpackage_path, '__init__.py'), 'w') as file:
+            file.write(_LAZY_PACKAGE_INIT.format(submodule_names=submodule_names, io_latency_s=io_latency_s))
+        for submodule_name in submodule_names:
+            with open(os.path.join(subpackage_path, f'{submodule_name}.py'), 'w') as file:
+                file.write(_module_source(n_classes=n_classes, n_functions=n_functions, n_methods=n_methods))
+    sys.path.insert(0, path)
+    try:
+        return importlib.import_module(name)
+    finally:
+        sys.path.remove(path)
@@ -0,0 +1,38 @@
+"""Cost of reading attributes of an instance of a wrapped class compared to the original instance
+
+Run with `python -m benchmarks.bench_attribute_access`.
+"""
+import json
+import timeit
+
+import module_wrapper
+from benchmarks._synthetic import make_package
+
+
+NUMBER = 20000
+
+
+def _per_access_ns(func):
+    return min(timeit.repeat(func, number=NUMBER, repeat=5)) / NUMBER * 1e9
+
+
+def run():
+    package = make_package(name='bench_attribute_access_package', n_modules=0, n_classes=1, n_functions=0,
+                           n_methods=5)
+    wrapped_package = module_wrapper.wrap(obj=package, wrapper=lambda func: func)
+    original_instance = package.Class0(1)
+    wrapped_instance = wrapped_package.Class0(1)
+    result = {}
+    for attr_kind, attr_name in [('data', 'value'), ('method', 'method_0')]:
+        original_ns = _per_access_ns(func=lambda: getattr(original_instance, attr_name))
+        wrapped_ns = _per_access_ns(func=lambda: getattr(wrapped_instance, attr_name))
+        result[attr_kind] = {
+            'original_ns': original_ns,
+            'wrapped_ns': wrapped_ns,
+            'slowdown': wrapped_ns / original_ns,
+        }
+    return result
+
+
+if __name__ == '__main__':
+    print(json.dumps(run(), indent=2))
@@ -0,0 +1,63 @@
+"""Time of many concurrent calls of a slow per-key lookup offloaded one by one compared to batched calls
+
+Run with `python -m benchmarks.bench_batching_wrapper`. Each call of the lookup and of its bulk implementation waits
+for `LATENCY_S` (stands for a network round-trip of a sync client).
+"""
+import asyncio
+import json
+import time
+
+import module_wrapper
+from benchmarks._synthetic import _make_module
+
+
+CALLS = 1000
+LATENCY_S = 0.001
+
+_CLIENT_SOURCE = f'''import time
+
+
+def get(key):
+    time.sleep({LATENCY_S!r})
+    return key
+
+
+def get_many(keys):
+    time.sleep({LATENCY_S!r})
+    return list(keys)
+'''
+
+
+def _gather_s(get):
+    async def main():
+        start = time.perf_counter()
+        await asyncio.gather(*[get(key) for key in range(CALLS)])
+        return time.perf_counter() - start
+
+    return asyncio.run(main())
+
+
+def run():
+    client = _make_module(name='bench_batching_wrapper_client', source=_CLIENT_SOURCE)
+
+    def bulk_hook(func):
+        if func.__name__ == 'get':
+            return lambda calls: client.get_many([args[0] for args, _ in calls])
+        return None
+
+    executor_wrapper = module_wrapper.ExecutorWrapper()
+    try:
+        return {
+            'calls': CALLS,
+            'executor_s': _gather_s(get=module_wrapper.wrap(obj=client, wrapper=executor_wrapper).get),
+            'batching_s': _gather_s(get=module_wrapper.wrap(
+                obj=client,
+                wrapper=module_wrapper.BatchingWrapper(bulk_hooks=[bulk_hook], wrapper=executor_wrapper),
+            ).get),
+        }
+    finally:
+        executor_wrapper.shutdown()
+
+
+if __name__ == '__main__':
+    print(json.dumps(run(), indent=2))
@@ -0,0 +1,96 @@
+"""Per-call overhead of wrapped functions compared to the same function decorated directly
+
+Run with `python -m benchmarks.bench_call_overhead`.
+"""
+import asyncio
+import cProfile
+from functools import wraps
+import json
+import time
+import timeit
+
+import module_wrapper
+from benchmarks._synthetic import make_package
+
+
+NUMBER = 200000
+ASYNC_NUMBER = 20000
+
+
+def decorator(func):
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        return func(*args, **kwargs)
+    return wrapper
+
+
+def _per_call_ns(func):
+    return min(timeit.repeat(lambda: func(1), number=NUMBER, repeat=5)) / NUMBER * 1e9
+
+
+def _per_item_sync_ns(func):
+    def consume():
+        for _ in func(NUMBER):
+            pass
+
+    return min(timeit.repeat(consume, number=1, repeat=5)) / NUMBER * 1e9
+
+
+def _per_call_under_cprofile_ns(func):
+    profile = cProfile.Profile()
+    profile.enable()
+    try:
+        return _per_call_ns(func=func)
+    finally:
+        profile.disable()
+
+
+def _per_await_ns(func):
+    async def main():
+        start = time.perf_counter()
+        for _ in range(ASYNC_NUMBER):
+            await func(1)
+        return time.perf_counter() - start
+
+    return min(asyncio.run(main()) for _ in range(5)) / ASYNC_NUMBER * 1e9
+
+
+def _per_item_ns(func):
+    async def main():
+        start = time.perf_counter()
+        async for _ in func(ASYNC_NUMBER):
+            pass
+        return time.perf_counter() - start
+
+    return min(asyncio.run(main()) for _ in range(5)) / ASYNC_NUMBER * 1e9
+
+
+def run():
+    package = make_package(name='bench_call_overhead_package', n_modules=0, n_classes=0, n_functions=1,
+                           n_async_functions=1, n_generators=1)
+    wrapped_package = module_wrapper.wrap(obj=package, wrapper=decorator)
+    wrapped_instrumented_package = module_wrapper.wrap(obj=package, wrapper=decorator,
+                                                       instrument=module_wrapper.CallStatistics())
+    wrapped_package_with_return_values = module_wrapper.wrap(obj=package, wrapper=decorator, wrap_return_values=True)
+    return {
+        'plain_ns': _per_call_ns(func=package.function_0),
+        'decorated_ns': _per_call_ns(func=decorator(package.function_0)),
+        'wrapped_ns': _per_call_ns(func=wrapped_package.function_0),
+        'wrapped_instrumented_ns': _per_call_ns(func=wrapped_instrumented_package.function_0),
+        'wrapped_under_cprofile_ns': _per_call_under_cprofile_ns(func=wrapped_package.function_0),
+        'generator_plain_per_item_ns': _per_item_sync_ns(func=package.generator_0),
+        'generator_wrapped_with_return_values_per_item_ns': _per_item_sync_ns(
+            func=wrapped_package_with_return_values.generator_0,
+        ),
+        'async_plain_ns': _per_await_ns(func=package.async_function_0),
+        'async_wrapped_ns': _per_await_ns(func=wrapped_package.async_function_0),
+        'async_wrapped_with_return_values_ns': _per_await_ns(func=wrapped_package_with_return_values.async_function_0),
+        'async_generator_plain_per_item_ns': _per_item_ns(func=package.async_generator_0),
+        'async_generator_wrapped_with_return_values_per_item_ns': _per_item_ns(
+            func=wrapped_package_with_return_values.async_generator_0,
+        ),
+    }
+
+
+if __name__ == '__main__':
+    print(json.dumps(run(), indent=2))
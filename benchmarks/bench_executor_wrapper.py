@@ -0,0 +1,56 @@
+"""Per-call time of a cheap function offloaded by ExecutorWrapper compared to the aioify-style wrapper
+
+Run with `python -m benchmarks.bench_executor_wrapper`.
+"""
+import asyncio
+from functools import partial, wraps
+import json
+import time
+
+import module_wrapper
+from benchmarks._synthetic import make_package
+
+
+NUMBER = 5000
+
+
+def aioify_wrapper(func):
+    @wraps(func)
+    async def run(*args, **kwargs):
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(None, partial(func, *args, **kwargs))
+    return run
+
+
+def _per_await_ns(func):
+    async def main():
+        # Warm up executors and the inline fast path
+        for _ in range(module_wrapper.ExecutorWrapper.INLINE_SAMPLES):
+            await func(1)
+        start = time.perf_counter()
+        for _ in range(NUMBER):
+            await func(1)
+        return time.perf_counter() - start
+
+    return min(asyncio.run(main()) for _ in range(3)) / NUMBER * 1e9
+
+
+def run():
+    package = make_package(name='bench_executor_wrapper_package', n_modules=0, n_classes=0, n_functions=1)
+    executor_wrapper = module_wrapper.ExecutorWrapper(max_concurrency=16)
+    inline_executor_wrapper = module_wrapper.ExecutorWrapper(max_concurrency=16, inline_threshold=1e-4)
+    try:
+        return {
+            'aioify_ns': _per_await_ns(func=module_wrapper.wrap(obj=package, wrapper=aioify_wrapper).function_0),
+            'executor_ns': _per_await_ns(func=module_wrapper.wrap(obj=package, wrapper=executor_wrapper).function_0),
+            'inline_fast_path_ns': _per_await_ns(
+                func=module_wrapper.wrap(obj=package, wrapper=inline_executor_wrapper).function_0,
+            ),
+        }
+    finally:
+        executor_wrapper.shutdown()
+        inline_executor_wrapper.shutdown()
+
+
+if __name__ == '__main__':
+    print(json.dumps(run(), indent=2))
@@ -0,0 +1,34 @@
+"""Time of enumerating members of a large class and of a module with getmembers() compared to iter_members()
+
+Run with `python -m benchmarks.bench_getmembers`.
+"""
+import inspect
+import json
+import timeit
+
+import module_wrapper
+from benchmarks._synthetic import make_package
+
+
+NUMBER = 200
+
+
+def _per_call_us(func):
+    return min(timeit.repeat(func, number=NUMBER, repeat=5)) / NUMBER * 1e6
+
+
+def run():
+    package = make_package(name='bench_getmembers_package', n_modules=0, n_classes=1, n_functions=200, n_methods=500)
+    result = {}
+    for obj_kind, obj in [('class', package.Class0), ('module', package)]:
+        result[obj_kind] = {
+            'members': len(module_wrapper.getmembers(obj)),
+            'inspect_getmembers_us': _per_call_us(func=lambda: inspect.getmembers(obj)),
+            'getmembers_us': _per_call_us(func=lambda: module_wrapper.getmembers(obj)),
+            'iter_members_us': _per_call_us(func=lambda: list(module_wrapper.iter_members(obj))),
+        }
+    return result
+
+
+if __name__ == '__main__':
+    print(json.dumps(run(), indent=2))
@@ -0,0 +1,72 @@
+"""Time to the first call of a function of a lazily importing package, wrapped in advance compared to wrapped on import
+
+Run with `python -m benchmarks.bench_import_hook`. The package has `N_PACKAGES` subpackages, which import their
+submodules on first attribute access, only one submodule is used.
+"""
+import importlib
+import json
+import shutil
+import sys
+import tempfile
+import time
+
+import module_wrapper
+from benchmarks._synthetic import write_lazy_package
+
+
+NAME = 'bench_import_hook_package'
+PREFIX = 'bench_import_hook_wrapped'
+N_PACKAGES = 10
+REPEAT = 3
+
+
+def _unload():
+    for module_name in [module_name for module_name in sys.modules
+                        if module_name.partition('.')[0] in (NAME, PREFIX)]:
+        del sys.modules[module_name]
+    importlib.invalidate_caches()
+
+
+def _imported_modules():
+    return sum(module_name.startswith(f'{NAME}.') for module_name in sys.modules)
+
+
+def _wrap_in_advance_s():
+    _unload()
+    start = time.perf_counter()
+    package = module_wrapper.wrap(obj=importlib.import_module(NAME), wrapper=lambda func: func)
+    package.package_0.module_0.function_0(1)
+    return time.perf_counter() - start
+
+
+def _wrap_on_import_s():
+    _unload()
+    start = time.perf_counter()
+    with module_wrapper.install_import_hook(prefix=PREFIX, wrapping_scope_regex=rf'{NAME}(\..*)?',
+                                            wrapper=lambda func: func):
+        package = importlib.import_module(f'{PREFIX}.{NAME}')
+        package.package_0.module_0.function_0(1)
+    return time.perf_counter() - start
+
+
+def run(n_modules=10, n_classes=10, n_functions=10, n_methods=10):
+    path = tempfile.mkdtemp()
+    sys.path.insert(0, path)
+    try:
+        write_lazy_package(path=path, name=NAME, n_packages=N_PACKAGES, n_modules=n_modules, n_classes=n_classes,
+                           n_functions=n_functions, n_methods=n_methods)
+        result = {}
+        for mode, func in [('wrap_in_advance', _wrap_in_advance_s), ('wrap_on_import', _wrap_on_import_s)]:
+            # The first run compiles the submodules
+            func()
+            result[f'{mode}_s'] = min(func() for _ in range(REPEAT))
+            result[f'{mode}_imported_modules'] = _imported_modules()
+        return result
+    finally:
+        _unload()
+        sys.path.remove(path)
+        shutil.rmtree(path, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    print(json.dumps(run(), indent=2))
@@ -0,0 +1,43 @@
+"""Import time of module_wrapper measured with `python -X importtime`
+
+Run with `python -m benchmarks.bench_import_time [--max-us MICROSECONDS]`, the exit code is non-zero if the cumulative
+import time exceeds the limit.
+"""
+import argparse
+import json
+import subprocess
+import sys
+
+
+REPEAT = 5
+
+
+def _import_time_us(module_name):
+    process = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module_name}'],
+                             stderr=subprocess.PIPE, universal_newlines=True, check=True)
+    for line in process.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        _, _, fields = line.partition('import time:')
+        self_us, cumulative_us, imported = (field.strip() for field in fields.split('|'))
+        if imported == module_name:
+            return {'self_us': int(self_us), 'cumulative_us': int(cumulative_us)}
+    raise RuntimeError(f'{module_name} import time not found in the output of -X importtime')
+
+
+def run(module_name='module_wrapper'):
+    results = [_import_time_us(module_name=module_name) for _ in range(REPEAT)]
+    return {key: min(result[key] for result in results) for key in ['self_us', 'cumulative_us']}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.partition('\n')[0])
+    parser.add_argument('--max-us', type=int, help='fail if the cumulative import time exceeds this limit')
+    args = parser.parse_args()
+    result = run()
+    print(json.dumps(result, indent=2))
+    if args.max_us is not None and result['cumulative_us'] > args.max_us:
+        sys.exit(f"import time {result['cumulative_us']}us exceeds the limit of {args.max_us}us")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,33 @@
+"""Cost of creating instances of a wrapped class compared to the original class
+
+Run with `python -m benchmarks.bench_instance_creation`.
+"""
+import json
+import timeit
+
+import module_wrapper
+from benchmarks._synthetic import make_package
+
+
+NUMBER = 20000
+
+
+def _per_instance_ns(cls):
+    return min(timeit.repeat(lambda: cls(1), number=NUMBER, repeat=5)) / NUMBER * 1e9
+
+
+def run():
+    package = make_package(name='bench_instance_creation_package', n_modules=0, n_classes=1, n_functions=0,
+                           n_methods=20)
+    wrapped_package = module_wrapper.wrap(obj=package, wrapper=lambda func: func)
+    original_ns = _per_instance_ns(cls=package.Class0)
+    wrapped_ns = _per_instance_ns(cls=wrapped_package.Class0)
+    return {
+        'original_ns': original_ns,
+        'wrapped_ns': wrapped_ns,
+        'slowdown': wrapped_ns / original_ns,
+    }
+
+
+if __name__ == '__main__':
+    print(json.dumps(run(), indent=2))
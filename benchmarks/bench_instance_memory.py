@@ -0,0 +1,43 @@
+"""Memory used by instances of a wrapped class compared to instances of the original class
+
+Run with `python -m benchmarks.bench_instance_memory`. Memory is measured with `tracemalloc` and includes everything
+allocated per instance by wrapping (new instances are registered in the cache of wrapped objects only if return values
+are wrapped, which this benchmark does not do).
+"""
+import json
+import tracemalloc
+
+import module_wrapper
+from benchmarks._synthetic import make_package
+
+
+NUMBER = 100000
+
+
+def _per_instance_bytes(cls):
+    tracemalloc.start()
+    try:
+        instances = [cls(index) for index in range(NUMBER)]
+        size, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    _ = instances
+    return size / NUMBER
+
+
+def run():
+    package = make_package(name='bench_instance_memory_package', n_modules=0, n_classes=1, n_functions=0,
+                           n_methods=5)
+    context = module_wrapper.WrappingContext(wrapper=lambda func: func)
+    wrapped_package = context.wrap(obj=package)
+    original_bytes = _per_instance_bytes(cls=package.Class0)
+    wrapped_bytes = _per_instance_bytes(cls=wrapped_package.Class0)
+    return {
+        'original_bytes': original_bytes,
+        'wrapped_bytes': wrapped_bytes,
+        'ratio': wrapped_bytes / original_bytes,
+    }
+
+
+if __name__ == '__main__':
+    print(json.dumps(run(), indent=2))
@@ -0,0 +1,60 @@
+"""Per-call time of an expensive deterministic function with and without MemoizingWrapper
+
+Run with `python -m benchmarks.bench_memoizing_wrapper`. The function is called with `KEYS` distinct arguments in turn.
+"""
+import asyncio
+import json
+import time
+import timeit
+
+import module_wrapper
+from benchmarks._synthetic import _make_module
+
+
+NUMBER = 20000
+KEYS = 100
+
+_LIBRARY_SOURCE = '''import asyncio
+
+
+def expensive(n):
+    return sum(range(n % 100 * 100))
+
+
+async def fetch(n):
+    await asyncio.sleep(0.001)
+    return n
+'''
+
+
+def _per_call_ns(func):
+    keys = iter(range(NUMBER * 5))
+    return min(timeit.repeat(lambda: func(next(keys) % KEYS), number=NUMBER, repeat=5)) / NUMBER * 1e9
+
+
+def _gather_s(func):
+    async def main():
+        start = time.perf_counter()
+        await asyncio.gather(*[func(key % KEYS) for key in range(NUMBER)])
+        return time.perf_counter() - start
+
+    return asyncio.run(main())
+
+
+def run():
+    library = _make_module(name='bench_memoizing_wrapper_library', source=_LIBRARY_SOURCE)
+    memoizing_wrapper = module_wrapper.MemoizingWrapper(patterns=['expensive', 'fetch'], maxsize=KEYS, ttl=60.0)
+    wrapped_library = module_wrapper.wrap(obj=library, wrapper=memoizing_wrapper)
+    result = {
+        'plain_ns': _per_call_ns(func=library.expensive),
+        'memoized_ns': _per_call_ns(func=wrapped_library.expensive),
+        'async_concurrent_plain_s': _gather_s(func=library.fetch),
+    }
+    memoizing_wrapper.clear()
+    result['async_concurrent_memoized_s'] = _gather_s(func=wrapped_library.fetch)
+    result['async_concurrent_memoized_cache_info'] = memoizing_wrapper.cache_info()._asdict()
+    return result
+
+
+if __name__ == '__main__':
+    print(json.dumps(run(), indent=2))
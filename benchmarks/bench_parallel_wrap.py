@@ -0,0 +1,43 @@
+"""Wall-clock time of wrapping a large package with lazily imported submodules with and without worker threads
+
+Run with `python -m benchmarks.bench_parallel_wrap`. Importing submodules waits for storage (simulated with a sleep of
+`IO_LATENCY_S`), which is where threads pay off, pure Python wrapping work is serialized by the GIL.
+"""
+import json
+import sys
+import tempfile
+import time
+
+import module_wrapper
+from benchmarks._synthetic import write_lazy_package
+
+
+IO_LATENCY_S = 0.005
+WORKERS = [None, 4, 16]
+
+
+def _wrap_time_s(io_latency_s, workers):
+    name = 'bench_parallel_wrap_package'
+    with tempfile.TemporaryDirectory() as path:
+        package = write_lazy_package(path=path, name=name, n_packages=20, n_modules=5, n_classes=5, n_functions=10,
+                                     n_methods=10, io_latency_s=io_latency_s)
+        start = time.perf_counter()
+        module_wrapper.wrap(obj=package, wrapper=lambda func: func, workers=workers)
+        result = time.perf_counter() - start
+    for module_name in [module_name for module_name in sys.modules
+                        if module_name == name or module_name.startswith(f'{name}.')]:
+        del sys.modules[module_name]
+    return result
+
+
+def run():
+    return {
+        f'io_latency_{io_latency_s * 1000:g}ms': {
+            f'workers_{workers}': _wrap_time_s(io_latency_s=io_latency_s, workers=workers) for workers in WORKERS
+        }
+        for io_latency_s in [0.0, IO_LATENCY_S]
+    }
+
+
+if __name__ == '__main__':
+    print(json.dumps(run(), indent=2))
@@ -0,0 +1,51 @@
+"""Wall-clock time and peak memory of wrap() on a synthetic package of configurable size
+
+Run with `python -m benchmarks.bench_wrap`. Memory is measured with `tracemalloc` in a separate wrapping, since tracing
+slows allocations down.
+"""
+import json
+import time
+import tracemalloc
+
+import module_wrapper
+from benchmarks._synthetic import make_package
+
+
+REPEAT = 5
+
+
+def _make_package(n_modules, n_classes, n_functions, n_methods):
+    return make_package(name='bench_wrap_package', n_modules=n_modules, n_classes=n_classes, n_functions=n_functions,
+                        n_methods=n_methods)
+
+
+def _wrap_time_s(package):
+    start = time.perf_counter()
+    module_wrapper.wrap(obj=package, wrapper=lambda func: func)
+    return time.perf_counter() - start
+
+
+def _wrap_memory(package):
+    tracemalloc.start()
+    try:
+        wrapped_package = module_wrapper.wrap(obj=package, wrapper=lambda func: func)
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    _ = wrapped_package
+    return {'retained_bytes': current, 'peak_bytes': peak}
+
+
+def run(n_modules=20, n_classes=20, n_functions=20, n_methods=10):
+    package = _make_package(n_modules=n_modules, n_classes=n_classes, n_functions=n_functions, n_methods=n_methods)
+    wrap_times_s = [_wrap_time_s(package=package) for _ in range(REPEAT)]
+    return {
+        'wrapped_objects': (n_modules + 1) * (1 + n_functions + n_classes * (1 + n_methods)),
+        'wrap_time_s': min(wrap_times_s),
+        'wrap_time_max_s': max(wrap_times_s),
+        **_wrap_memory(package=package),
+    }
+
+
+if __name__ == '__main__':
+    print(json.dumps(run(), indent=2))
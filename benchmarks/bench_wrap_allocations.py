@@ -0,0 +1,44 @@
+"""Type objects created and time spent by wrap() on a large synthetic package
+
+Run with `python -m benchmarks.bench_wrap_allocations`.
+"""
+import gc
+import json
+import time
+
+import module_wrapper
+from benchmarks._synthetic import make_package
+
+
+def _count_types():
+    return sum(1 for obj in gc.get_objects() if isinstance(obj, type))
+
+
+def run(n_modules=20, n_classes=20, n_functions=20, n_methods=10):
+    package = make_package(name='bench_wrap_allocations_package',
+                           n_modules=n_modules,
+                           n_classes=n_classes,
+                           n_functions=n_functions,
+                           n_methods=n_methods)
+    gc.collect()
+    gc.disable()
+    try:
+        types_before = _count_types()
+        start = time.perf_counter()
+        wrapped_package = module_wrapper.wrap(obj=package, wrapper=lambda func: func)
+        wrap_time = time.perf_counter() - start
+        types_created = _count_types() - types_before
+    finally:
+        gc.enable()
+    n_wrapped_classes = (n_modules + 1) * n_classes
+    _ = wrapped_package
+    return {
+        'wrapped_classes': n_wrapped_classes,
+        'types_created': types_created,
+        'types_created_per_wrapped_class': types_created / n_wrapped_classes,
+        'wrap_time_s': wrap_time,
+    }
+
+
+if __name__ == '__main__':
+    print(json.dumps(run(), indent=2))
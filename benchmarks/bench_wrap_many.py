@@ -0,0 +1,38 @@
+"""Time of wrapping several standard library modules, which share dependencies, with wrap_many() compared to wrap()
+
+Run with `python -m benchmarks.bench_wrap_many`.
+"""
+import importlib
+import json
+import time
+
+import module_wrapper
+
+
+MODULE_NAMES = ['asyncio', 'concurrent.futures', 'selectors', 'socket', 'ssl', 'subprocess']
+
+
+def _wrap_each_s(objs):
+    start = time.perf_counter()
+    for obj in objs:
+        module_wrapper.wrap(obj=obj, wrapper=lambda func: func)
+    return time.perf_counter() - start
+
+
+def _wrap_many_s(objs):
+    start = time.perf_counter()
+    module_wrapper.wrap_many(objs=objs, wrapper=lambda func: func)
+    return time.perf_counter() - start
+
+
+def run():
+    objs = [importlib.import_module(module_name) for module_name in MODULE_NAMES]
+    return {
+        'modules': len(objs),
+        'wrap_each_s': min(_wrap_each_s(objs=objs) for _ in range(3)),
+        'wrap_many_s': min(_wrap_many_s(objs=objs) for _ in range(3)),
+    }
+
+
+if __name__ == '__main__':
+    print(json.dumps(run(), indent=2))
@@ -0,0 +1,118 @@
+"""Run the benchmarks and write their results as JSON, so that runs can be compared over time
+
+Run with `python -m benchmarks.run [--only NAME ...] [--output PATH] [--compare PATH] [--modules N] [--classes N]
+[--functions N] [--methods N]`. Sizes of synthetic packages are passed to benchmarks, which accept them. With
+`--compare`, ratios of numeric results to the results of a previous run are printed.
+"""
+import argparse
+import datetime
+import importlib
+import inspect
+import json
+import os
+import pkgutil
+import platform
+import subprocess
+import sys
+
+import module_wrapper
+
+
+_SIZE_PARAMETERS = {
+    'modules': 'n_modules',
+    'classes': 'n_classes',
+    'functions': 'n_functions',
+    'methods': 'n_methods',
+}
+
+
+def get_benchmark_names():
+    """Return names of the benchmarks (modules `benchmarks.bench_*`)"""
+    path = os.path.dirname(os.path.abspath(__file__))
+    return sorted(module_info.name[len('bench_'):] for module_info in pkgutil.iter_modules([path])
+                  if module_info.name.startswith('bench_'))
+
+
+def _get_git_revision():
+    try:
+        process = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=os.path.dirname(os.path.abspath(__file__)),
+                                 stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, universal_newlines=True,
+                                 check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return process.stdout.strip()
+
+
+def run(names=None, sizes=None):
+    """
+    Run benchmarks
+
+    :param Optional[Collection[str]] names: Names of benchmarks to run, all of them if not passed
+    :param Optional[Dict[str, int]] sizes: Sizes of synthetic packages by parameter names of benchmarks (`n_modules`, \
+    `n_classes`, `n_functions`, `n_methods`)
+    :return: Dict of the environment and results by benchmark names
+    """
+    results = {}
+    for name in names or get_benchmark_names():
+        benchmark = importlib.import_module(f'benchmarks.bench_{name}')
+        parameters = inspect.signature(benchmark.run).parameters
+        kwargs = {key: value for key, value in (sizes or {}).items() if key in parameters}
+        results[name] = benchmark.run(**kwargs)
+    return {
+        'environment': {
+            'module_wrapper_version': module_wrapper.__version__,
+            'git_revision': _get_git_revision(),
+            'python_version': sys.version,
+            'platform': platform.platform(),
+            'time': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            'sizes': sizes or {},
+        },
+        'results': results,
+    }
+
+
+def _flatten(result, prefix=''):
+    if isinstance(result, dict):
+        for key, value in result.items():
+            yield from _flatten(result=value, prefix=f'{prefix}.{key}' if prefix else key)
+    elif isinstance(result, (int, float)) and not isinstance(result, bool):
+        yield prefix, result
+
+
+def compare(results, previous_results):
+    """
+    Compare results of benchmarks with the results of a previous run
+
+    :param Dict[str, Any] results: Results of benchmarks (the `results` item of the `run` result)
+    :param Dict[str, Any] previous_results: Results of the previous run
+    :return: Dict of ratios of numeric results to the previous ones by dotted paths
+    """
+    previous = dict(_flatten(result=previous_results))
+    return {path: value / previous[path] for path, value in _flatten(result=results) if previous.get(path)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run module_wrapper benchmarks')
+    parser.add_argument('--only', nargs='+', choices=get_benchmark_names(), help='Benchmarks to run')
+    parser.add_argument('--output', help='Path of the JSON file to write results to (stdout if not passed)')
+    parser.add_argument('--compare', help='Path of the JSON file with results of a previous run')
+    for option in _SIZE_PARAMETERS:
+        parser.add_argument(f'--{option}', type=int, help=f'Number of {option} of synthetic packages')
+    args = parser.parse_args()
+    sizes = {parameter: getattr(args, option) for option, parameter in _SIZE_PARAMETERS.items()
+             if getattr(args, option) is not None}
+    report = run(names=args.only, sizes=sizes)
+    if args.output is None:
+        print(json.dumps(report, indent=2))
+    else:
+        with open(args.output, 'w') as file:
+            json.dump(report, file, indent=2)
+    if args.compare is not None:
+        with open(args.compare) as file:
+            previous_report = json.load(file)
+        for path, ratio in compare(results=report['results'], previous_results=previous_report['results']).items():
+            print(f'{path}: {ratio:.3f}x', file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
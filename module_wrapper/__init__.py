@@ -1,19 +1,235 @@
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict, namedtuple
 from contextlib import suppress
 from enum import IntEnum
-from functools import wraps
+from fnmatch import fnmatchcase
+from functools import lru_cache, partial, wraps
+import importlib
+from importlib.machinery import ModuleSpec
+import importlib.util
 import inspect
+import operator
 import re
-import stdlib_list
+import sys
+import threading
+from time import monotonic, perf_counter
 import types
+import weakref
 
+# asyncio and concurrent.futures are imported by the functions using them, since importing them takes longer than
+# importing the rest of the package (see benchmarks/bench_import_time.py)
 
-__all__ = ['wrap', '__version__']
+
+__all__ = ['wrap', 'wrap_many', 'install_import_hook', 'BatchingWrapper', 'CallStatistics', 'ExecutorWrapper',
+           'MemoizingWrapper', 'WrappedObjectsCache', 'WrappingContext', 'WrappingImportHook', 'WrappingScope',
+           'WrapReport', 'call_statistics', '__version__']
 __version__ = "0.3.1"
 
 
-STDLIB_MODULE_NAMES = stdlib_list.stdlib_list()
-STDLIB_MODULE_NAMES_REGEX = f"({'|'.join(re.escape(stdlib_module_name) for stdlib_module_name in STDLIB_MODULE_NAMES)})"
-_wrapped_objs = {}
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'maxsize', 'currsize'])
+
+
+class _StrongReference:
+    __slots__ = ('obj', )
+
+    def __init__(self, obj):
+        self.obj = obj
+
+    def __call__(self):
+        return self.obj
+
+
+class WrappedObjectsCache:
+    """
+    Cache of wrapped objects
+
+    Original and wrapped objects are referenced weakly where possible, and the entry is evicted as soon as the wrapped
+    object is collected (wrapped objects reference their originals), so that the cache does not keep originals alive.
+    Originals, which do not support weak references, are looked up by value if they are hashable, and by identity
+    (keeping a strong reference, so that the id is not reused) otherwise. The cache is thread-safe.
+    """
+
+    def __init__(self, maxsize=None):
+        """
+        :param Optional[int] maxsize: Maximum number of entries, least recently used entries are evicted if it is \
+        exceeded (unbounded if None)
+        """
+        self.maxsize = maxsize
+        # Values are tuples of the reference to the original (None if the original is a part of the key) and the
+        # reference to the wrapped object
+        self._entries = OrderedDict()
+        self._pending_removals = []
+        # Shared by the references to wrapped objects, which carry their keys, instead of a callback per entry
+        self._on_collected = self._schedule_removal
+        self._hits = 0
+        self._misses = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _make_key(obj, key):
+        if type(obj).__weakrefoffset__:
+            return ('id', id(obj)) + key
+        try:
+            hash(obj)
+        except TypeError:
+            return ('id', id(obj)) + key
+        return ('value', type(obj), obj) + key
+
+    def _schedule_removal(self, reference):
+        # Called by the garbage collector (possibly while the lock is held), so the entries are not modified here
+        self._pending_removals.append(reference.key)
+
+    def _remove_pending(self):
+        while self._pending_removals:
+            key = self._pending_removals.pop()
+            entry = self._entries.get(key)
+            if entry is not None and entry[1]() is None:
+                del self._entries[key]
+
+    def _lookup(self, obj, key):
+        entry = self._entries.get(key)
+        if entry is not None:
+            obj_reference, wrapped_reference = entry
+            wrapped = wrapped_reference()
+            if wrapped is not None and (obj_reference is None or obj_reference() is obj):
+                self._entries.move_to_end(key)
+                return wrapped
+        raise KeyError(key)
+
+    def get(self, obj, key):
+        """
+        Return wrapped `obj`
+
+        :param Any obj: Original object
+        :param Hashable key: Parameters of wrapping
+        :return: Wrapped `obj`
+        :raise KeyError: If `obj` was not wrapped with these parameters
+        """
+        key = self._make_key(obj=obj, key=key)
+        with self._lock:
+            self._remove_pending()
+            try:
+                wrapped = self._lookup(obj=obj, key=key)
+            except KeyError:
+                self._misses += 1
+                raise
+            self._hits += 1
+            return wrapped
+
+    def set(self, obj, key, wrapped):
+        """
+        Remember wrapped `obj`
+
+        :param Any obj: Original object
+        :param Hashable key: Parameters of wrapping
+        :param Any wrapped: Wrapped `obj`
+        """
+        key = self._make_key(obj=obj, key=key)
+        with self._lock:
+            self._remove_pending()
+            self._set(obj=obj, key=key, wrapped=wrapped)
+
+    def setdefault(self, obj, key, wrapped):
+        """
+        Remember wrapped `obj` unless it is already cached
+
+        :param Any obj: Original object
+        :param Hashable key: Parameters of wrapping
+        :param Any wrapped: Wrapped `obj`
+        :return: Cached wrapped `obj` (`wrapped` if it was not cached)
+        """
+        key = self._make_key(obj=obj, key=key)
+        with self._lock:
+            self._remove_pending()
+            with suppress(KeyError):
+                return self._lookup(obj=obj, key=key)
+            self._set(obj=obj, key=key, wrapped=wrapped)
+        return wrapped
+
+    def _set(self, obj, key, wrapped):
+        try:
+            wrapped_reference = weakref.KeyedRef(wrapped, self._on_collected, key)
+        except TypeError:
+            wrapped_reference = _StrongReference(obj=wrapped)
+        if key[0] == 'value' or isinstance(wrapped, Proxy):
+            # Proxies keep their originals alive, so the id of the original is not reused while the proxy is alive
+            obj_reference = None
+        elif wrapped is obj:
+            obj_reference = wrapped_reference
+        else:
+            # Only used to check the identity: the wrapped object keeps the original alive
+            try:
+                obj_reference = weakref.ref(obj)
+            except TypeError:
+                obj_reference = _StrongReference(obj=obj)
+        self._entries.pop(key, None)
+        self._entries[key] = obj_reference, wrapped_reference
+        if self.maxsize is not None:
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Remove all entries and reset statistics"""
+        with self._lock:
+            self._entries.clear()
+            self._pending_removals.clear()
+            self._hits = 0
+            self._misses = 0
+
+    def cache_info(self):
+        """
+        Return cache statistics
+
+        :return: Named tuple of hits, misses, maxsize and currsize
+        """
+        with self._lock:
+            self._remove_pending()
+            return CacheInfo(hits=self._hits, misses=self._misses, maxsize=self.maxsize, currsize=len(self._entries))
+
+    def __len__(self):
+        with self._lock:
+            self._remove_pending()
+            return len(self._entries)
+
+
+_wrapped_objs = WrappedObjectsCache()
+
+
+@lru_cache(maxsize=None)
+def _get_stdlib_module_names():
+    # stdlib_list reads a data file, so it is imported only when the list is needed
+    import stdlib_list
+    return stdlib_list.stdlib_list()
+
+
+@lru_cache(maxsize=None)
+def _get_stdlib_top_level_module_names():
+    try:
+        stdlib_module_names = sys.stdlib_module_names
+    except AttributeError:
+        stdlib_module_names = _get_stdlib_module_names()
+    return frozenset(stdlib_module_name.partition('.')[0] for stdlib_module_name in stdlib_module_names)
+
+
+@lru_cache(maxsize=None)
+def _get_stdlib_module_names_regex():
+    return f"({'|'.join(re.escape(stdlib_module_name) for stdlib_module_name in _get_stdlib_module_names())})"
+
+
+def __getattr__(name):
+    # STDLIB_MODULE_NAMES and STDLIB_MODULE_NAMES_REGEX are computed on first access to speed up the import
+    if name == 'STDLIB_MODULE_NAMES':
+        return _get_stdlib_module_names()
+    elif name == 'STDLIB_MODULE_NAMES_REGEX':
+        return _get_stdlib_module_names_regex()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+if sys.version_info < (3, 7):
+    # Module `__getattr__` (PEP 562) is not supported, so the names are computed on import
+    STDLIB_MODULE_NAMES = _get_stdlib_module_names()
+    STDLIB_MODULE_NAMES_REGEX = _get_stdlib_module_names_regex()
 
 
 class ProxyType(IntEnum):
@@ -22,6 +238,14 @@ class ProxyType(IntEnum):
     OBJECT = 2
 
 
+class _ReturnValueKind(IntEnum):
+    UNWRAPPED = 0
+    COROUTINE = 1
+    ITERATOR = 2
+    ASYNC_ITERATOR = 3
+    WRAPPED = 4
+
+
 class ObjectType(IntEnum):
     MODULE = 0
     CLASS = 1
@@ -31,7 +255,136 @@ class ObjectType(IntEnum):
 
 
 class Proxy:
-    pass
+    __slots__ = ()
+
+
+# noinspection PyUnresolvedReferences
+class ModuleProxy(types.ModuleType, Proxy):
+    # noinspection PyShadowingNames
+    def __init__(self, name, doc=None):
+        super().__init__(name=name, doc=doc)
+
+
+class LazyModuleProxy(ModuleProxy):
+    """Module proxy, which wraps attributes of the original module on first access"""
+
+    __slots__ = ('__wrapping_context', '__original_module')
+
+    # noinspection PyShadowingNames
+    def __init__(self, name, wrapping_context, original_module, doc=None):
+        super().__init__(name=name, doc=doc)
+        self.__wrapping_context = wrapping_context
+        self.__original_module = original_module
+
+    def __getattr__(self, item):
+        # The attribute is not wrapped yet: wrap it and memoize the result in the module proxy.
+        try:
+            attr_value = getattr(self.__original_module, item)
+        except AttributeError:
+            raise AttributeError(f"module {self.__name__!r} has no attribute {item!r}") from None
+        attr_value_new = attr_value
+        # noinspection PyProtectedMember
+        with self.__wrapping_context._suppress(AttributeError, TypeError):
+            attr_value_new = self.__wrapping_context.wrap(obj=attr_value, name=_get_name(attr_value, item))
+        types.ModuleType.__setattr__(self, item, attr_value_new)
+        return attr_value_new
+
+    def __dir__(self):
+        return sorted(set(dir(self.__original_module)) | set(self.__dict__))
+
+
+class ObjectProxy(Proxy):
+    # The rest of the state is shared by the instances of the same class in the proxy class. Wrapped attribute values
+    # by attribute name (see `_getattribute_wrapper`) are set on first access to an attribute.
+    __slots__ = ('_original_obj', '_wrapped_attributes', '__weakref__')
+
+
+# Get and set the slots of object proxies bypassing `__getattribute__` and `__setattr__` of the proxy classes, getting
+# a slot of an object, which is not an object proxy, raises TypeError
+_get_original_obj_slot = ObjectProxy._original_obj.__get__
+_set_original_obj_slot = ObjectProxy._original_obj.__set__
+_get_wrapped_attributes_slot = ObjectProxy._wrapped_attributes.__get__
+_set_wrapped_attributes_slot = ObjectProxy._wrapped_attributes.__set__
+
+
+class IteratorProxy(Proxy):
+    """Proxy of iterator (e.g. generator), which wraps items of the original one as they are consumed"""
+
+    __slots__ = ('_original_obj', '_wrap_item', '_unwrapped_item_types', '_next', '__weakref__')
+
+    # noinspection PyShadowingNames
+    def __init__(self, original_obj, wrap_item, unwrapped_item_types=frozenset()):
+        """
+        :param Iterator original_obj: Original iterator
+        :param Callable[Any, Any] wrap_item: Function to wrap items with
+        :param Container[type] unwrapped_item_types: Types of items, which are never wrapped, so `wrap_item` is not \
+        called for them
+        """
+        self._original_obj = original_obj
+        self._wrap_item = wrap_item
+        self._unwrapped_item_types = unwrapped_item_types
+        self._next = original_obj.__next__
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        item = self._next()
+        if type(item) in self._unwrapped_item_types:
+            return item
+        return self._wrap_item(item)
+
+    def send(self, value):
+        return self._wrap_item(self._original_obj.send(value))
+
+    def throw(self, *args):
+        return self._wrap_item(self._original_obj.throw(*args))
+
+    def close(self):
+        return self._original_obj.close()
+
+    def __getattr__(self, item):
+        return getattr(self._original_obj, item)
+
+
+class AsyncIteratorProxy(Proxy):
+    """Proxy of async iterator (e.g. async generator), which wraps items of the original one as they are consumed"""
+
+    __slots__ = ('_original_obj', '_wrap_item', '_unwrapped_item_types', '_anext', '__weakref__')
+
+    # noinspection PyShadowingNames
+    def __init__(self, original_obj, wrap_item, unwrapped_item_types=frozenset()):
+        """
+        :param AsyncIterator original_obj: Original async iterator
+        :param Callable[Any, Any] wrap_item: Function to wrap items with
+        :param Container[type] unwrapped_item_types: Types of items, which are never wrapped, so `wrap_item` is not \
+        called for them
+        """
+        self._original_obj = original_obj
+        self._wrap_item = wrap_item
+        self._unwrapped_item_types = unwrapped_item_types
+        self._anext = original_obj.__anext__
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        item = await self._anext()
+        if type(item) in self._unwrapped_item_types:
+            return item
+        return self._wrap_item(item)
+
+    async def asend(self, value):
+        return self._wrap_item(await self._original_obj.asend(value))
+
+    async def athrow(self, *args):
+        return self._wrap_item(await self._original_obj.athrow(*args))
+
+    async def aclose(self):
+        return await self._original_obj.aclose()
+
+    def __getattr__(self, item):
+        return getattr(self._original_obj, item)
 
 
 MethodWrapper = type(''.__add__)
@@ -42,14 +395,13 @@ RAISES_EXCEPTION = object()
 
 
 # noinspection PyShadowingBuiltins
-def getmembers(object, predicate=None):
-    """Return all members of an object as (name, value) pairs sorted by name.
-    Optionally, only return members that satisfy a given predicate."""
+def _iter_members_generic(object):
+    # The same as `inspect.getmembers`, except that exceptions raised by getattr are returned as values and the members
+    # are not sorted
     if inspect.isclass(object):
         mro = (object,) + inspect.getmro(object)
     else:
         mro = ()
-    results = []
     processed = set()
     names = dir(object)
     # :dd any DynamicClassAttributes to the list of names if object is a class;
@@ -82,416 +434,2081 @@ def getmembers(object, predicate=None):
                 continue
         except Exception as e:
             value = (RAISES_EXCEPTION, e)
-        if not predicate or predicate(value):
-            results.append((key, value))
+        yield key, value
         processed.add(key)
-    results.sort(key=lambda pair: pair[0])
-    return results
 
 
-def _wrap(
-        obj,
-        wrapper=None,
-        methods_to_add=(),
-        name=None,
-        skip=(),
-        wrap_return_values=False,
-        wrapped_name_func=None,
-        wrapped=None,
-        wrapping_scope_regex=None,
-):
+def _is_data_descriptor(value):
+    value_type = type(value)
+    return hasattr(value_type, '__set__') or hasattr(value_type, '__delete__')
+
+
+@lru_cache(maxsize=128)
+def _get_data_descriptor_names(metaclass):
+    return frozenset(name for base in metaclass.__mro__ for name, value in base.__dict__.items()
+                     if _is_data_descriptor(value=value))
+
+
+# noinspection PyShadowingBuiltins
+def _iter_class_members(object):
+    # Reads the dicts along the MRO directly and binds descriptors the way `type.__getattribute__` does, which gives
+    # the same members as `dir` and `getattr` for classes, which metaclasses don't customize these
+    members = {}
+    for base in reversed(object.__mro__):
+        members.update(base.__dict__)
+    # Data descriptors of the metaclass (e.g. `__doc__` or `__class__`) take precedence
+    overridden_members = {key: getmember(object, key)
+                          for key in members.keys() & _get_data_descriptor_names(type(object))}
+    members.update(overridden_members)
+    function_type = types.FunctionType
+    for key, value in members.items():
+        value_type = type(value)
+        # Functions are the most common members, they are returned as is by `__get__`
+        if value_type is not function_type and key not in overridden_members:
+            get = getattr(value_type, '__get__', None)
+            if get is not None:
+                try:
+                    value = get(value, None, object)
+                except AttributeError:
+                    # E.g. DynamicClassAttribute: the value from the __dict__ is used, like in getmembers
+                    pass
+                except Exception as e:
+                    value = (RAISES_EXCEPTION, e)
+        yield key, value
+
+
+# noinspection PyShadowingBuiltins
+def iter_members(object):
     """
-    Wrap module, class, function or another variable recursively
+    Yield all members of an object as (name, value) pairs in no particular order
 
-    :param Any obj: Object to wrap recursively
-    :param Optional[Callable] wrapper: Wrapper to wrap functions and methods in (accepts function as argument)
-    :param Collection[Callable] methods_to_add: Container of functions, which accept class as argument, and return \
-    tuple of method name and method to add to all classes
-    :param Optional[str] name: Name of module to wrap to (if `obj` is module)
-    :param Collection[Union[str, type, Any]] skip: Items to skip wrapping (if an item of a collection is the str, wrap \
-    will check the obj name, if an item of a collection is the type, wrap will check the obj type, else wrap will \
-    check an item itself)
-    :param bool wrap_return_values: If try, wrap return values of callables (only types, supported by wrap function \
-    are supported)
-    :param Optional[Callable[Any, str]] wrapped_name_func: Function that accepts `obj` as argument and returns the \
-    name of wrapped `obj` that will be written into wrapped `obj`
-    :param Any wrapped: Object to wrap to
-    :param Optional[str] wrapping_scope_regex: regex for module names that should be wrapped
-    :return: Wrapped `obj`
+    Members are the same as the ones of `getmembers`. Members of modules and classes without custom `__dir__` and
+    attribute lookup are read from their `__dict__` (along the MRO for classes) instead of calling `getattr` for every
+    name returned by `dir`.
+
+    :param Any object: Object
+    :return: Iterator of (name, value) pairs
     """
-    # noinspection PyUnresolvedReferences
-    class ModuleProxy(types.ModuleType, Proxy):
-        # noinspection PyShadowingNames
-        def __init__(self, name, doc=None):
-            super().__init__(name=name, doc=doc)
+    if _has_members_in_dict(object):
+        # Data descriptors of the module type (e.g. `__dict__`) return the values from the dict or are not its keys.
+        # The items are copied, since importing submodules while wrapping adds them to the dict.
+        return iter(list(object.__dict__.items()))
+    if _has_members_in_mro_dicts(object):
+        return _iter_class_members(object)
+    return _iter_members_generic(object)
+
+
+# noinspection PyShadowingBuiltins
+def _has_members_in_dict(object):
+    return type(object) is types.ModuleType and '__dir__' not in object.__dict__
+
+
+# noinspection PyShadowingBuiltins
+def _has_members_in_mro_dicts(object):
+    object_type = type(object)
+    return (isinstance(object, type) and object_type.__dir__ is type.__dir__ and
+            object_type.__getattribute__ is type.__getattribute__ and not hasattr(object_type, '__getattr__'))
+
+
+def _get_class_snapshot(cls):
+    # Keys and values of the dicts along the MROs of the class and its metaclass, which the members are computed from
+    mro = cls.__mro__ + type(cls).__mro__
+    return mro, tuple((tuple(base.__dict__), tuple(base.__dict__.values())) for base in mro)
+
+
+def _is_class_snapshot_valid(cls, snapshot):
+    # Objects are compared by identity, so that `__eq__` of arbitrary values is never called
+    mro, dict_snapshots = snapshot
+    current_mro = cls.__mro__ + type(cls).__mro__
+    if len(current_mro) != len(mro) or not all(map(operator.is_, current_mro, mro)):
+        return False
+    for base, (keys, values) in zip(mro, dict_snapshots):
+        base_dict = base.__dict__
+        if (len(base_dict) != len(keys) or not all(map(operator.is_, base_dict, keys)) or
+                not all(map(operator.is_, base_dict.values(), values))):
+            return False
+    return True
+
+
+# noinspection PyShadowingBuiltins
+def getmembers(object, predicate=None):
+    """Return all members of an object as (name, value) pairs sorted by name.
+    Optionally, only return members that satisfy a given predicate."""
+    results = [(key, value) for key, value in iter_members(object) if not predicate or predicate(value)]
+    results.sort(key=lambda pair: pair[0])
+    return results
+
 
+# noinspection PyShadowingBuiltins
+def getmember(object, key):
+    """Return the member of an object by name the same way as getmembers does"""
     try:
-        # Subclassing from obj to pass isinstance(some_object, obj) checks. If defining the class fails, it means that
-        # `obj` was not a class, that means ClassProxy wouldn't be used, we can create a dummy class.
-        class ClassProxy(obj, Proxy):
-            @staticmethod
-            def __new__(cls, *args, **kwargs):
-                # noinspection PyUnresolvedReferences
-                original_obj_object = cls._original_obj(*args, **kwargs)
-                # noinspection PyArgumentList
-                result = _wrap(obj=original_obj_object,
-                               wrapper=wrapper,
-                               methods_to_add=methods_to_add,
-                               name=name,
-                               skip=skip,
-                               wrap_return_values=wrap_return_values,
-                               wrapped_name_func=wrapped_name_func,
-                               wrapping_scope_regex=wrapping_scope_regex)
-                return result
-    except TypeError:
-        class ClassProxy(Proxy):
-            pass
+        return getattr(object, key)
+    except AttributeError:
+        if inspect.isclass(object):
+            for base in (object,) + inspect.getmro(object):
+                if key in base.__dict__:
+                    return base.__dict__[key]
+        raise
+    except Exception as e:
+        return RAISES_EXCEPTION, e
 
-    class ObjectProxy(Proxy):
-        pass
 
-    # noinspection PyShadowingNames
-    def get_name(*names):
-        name = None
-        for obj in names:
-            try:
-                name = obj.__name__
-            except AttributeError:
-                if isinstance(obj, str):
-                    name = obj
-            if name is not None:
-                return name
-        return name
+class LazyAttribute:
+    """Class attribute descriptor, which wraps the original attribute on first access and replaces itself with the
+    result"""
 
-    # noinspection PyShadowingNames
-    def make_key(obj, wrapper, methods_to_add, name, skip, wrap_return_values, wrapped_name_func, wrapping_scope_regex):
+    def __init__(self, name, resolve):
+        self.name = name
+        self.resolve = resolve
+
+    def __get__(self, instance, owner):
+        value = self.resolve()
+        type.__setattr__(owner, self.name, value)
+        descriptor_get = getattr(type(value), '__get__', None)
+        if descriptor_get is None:
+            return value
+        return descriptor_get(value, instance, owner)
+
+
+# noinspection PyShadowingNames
+def _get_name(*names):
+    name = None
+    for obj in names:
         try:
-            obj_key = 'hash', hash(obj)
-        except TypeError:
-            obj_key = 'id', id(obj)
-        return obj_key + (
-            wrapper,
-            methods_to_add,
-            name,
-            skip,
-            wrap_return_values,
-            wrapped_name_func,
-            wrapping_scope_regex,
-        )
+            name = obj.__name__
+        except AttributeError:
+            if isinstance(obj, str):
+                name = obj
+        if name is not None:
+            return name
+    return name
 
-    # noinspection PyShadowingNames
-    def wrap_(obj, name, members, wrapped=None):
-        def get_obj_type():
-            if inspect.ismodule(object=obj):
-                result = ObjectType.MODULE
-            elif inspect.isclass(object=obj):
-                result = ObjectType.CLASS
-            elif (inspect.isbuiltin(object=obj) or
-                  inspect.isfunction(object=obj) or
-                  inspect.ismethod(object=obj) or
-                  inspect.ismethoddescriptor(object=obj) or
-                  isinstance(obj, MethodWrapper)):
-                result = ObjectType.FUNCTION_OR_METHOD
-            elif inspect.iscoroutine(object=obj):
-                result = ObjectType.COROUTINE
-            else:
-                result = ObjectType.OBJECT
-            return result
 
-        def create_proxy(proxy_type):
-            return {
-                ProxyType.MODULE: ModuleProxy(name=name),
-                ProxyType.CLASS: ClassProxy,
-                ProxyType.OBJECT: ObjectProxy(),
-            }[proxy_type]
-
-        def add_methods():
-            for method_to_add in methods_to_add:
-                method_name, method = method_to_add(wrapped)
-                if method is not None:
-                    setattr(wrapped, method_name, method)
-
-        def set_original_obj():
-            with suppress(AttributeError):
-                what = type if obj_type == ObjectType.CLASS else object
-                what.__setattr__(wrapped, wrapped_name_func(obj), obj)
-
-        def need_to_wrap():
-            return not is_magic_name(name=attr_name) or attr_name not in ['__class__', '__new__']
-
-        obj_type = get_obj_type()
-        if wrapped is None:
-            if obj_type in [ObjectType.MODULE, ObjectType.CLASS]:
-                wrapped = create_proxy(proxy_type=ProxyType.MODULE if inspect.ismodule(obj) else ProxyType.CLASS)
-            elif obj_type == ObjectType.FUNCTION_OR_METHOD:
-                wrapped = function_or_method_wrapper()
-            elif obj_type == ObjectType.COROUTINE:
-                wrapped = coroutine_wrapper()
-            else:
-                wrapped = create_proxy(proxy_type=ProxyType.OBJECT)
-        key = make_key(
-            obj=obj,
-            wrapper=wrapper,
-            methods_to_add=methods_to_add,
-            name=name,
-            skip=skip,
-            wrap_return_values=wrap_return_values,
-            wrapped_name_func=wrapped_name_func,
-            wrapping_scope_regex=wrapping_scope_regex,
-        )
-        _wrapped_objs[key] = wrapped
-        set_original_obj()
-        if obj_type in [ObjectType.FUNCTION_OR_METHOD, ObjectType.COROUTINE]:
-            return wrapped
-        add_methods()
-        if obj_type in {ObjectType.MODULE, ObjectType.CLASS}:
-            for attr_name, attr_value in members:
-                if need_to_wrap():
-                    raises_exception = (isinstance(attr_value, tuple) and
-                                        len(attr_value) > 0 and
-                                        attr_value[0] == RAISES_EXCEPTION)
-                    if raises_exception and not obj_type == ObjectType.MODULE:
-                        def raise_exception(self):
-                            _ = self
-                            raise attr_value[1]
-                        attr_value = property(raise_exception)
-                    with suppress(AttributeError, TypeError):
-                        # noinspection PyArgumentList
-                        attr_value_new = _wrap(obj=attr_value,
-                                               wrapper=wrapper,
-                                               methods_to_add=methods_to_add,
-                                               name=get_name(attr_value, attr_name),
-                                               skip=skip,
-                                               wrap_return_values=wrap_return_values,
-                                               wrapped_name_func=wrapped_name_func,
-                                               wrapping_scope_regex=wrapping_scope_regex)
-                        with suppress(Exception):
-                            base_type = {
-                                ObjectType.MODULE: types.ModuleType,
-                                ObjectType.CLASS: type,
-                            }[obj_type]
-                            base_type.__setattr__(wrapped, attr_name, attr_value_new)
-        else:
-            wrapped_class_name = get_name(obj.__class__)
-            # noinspection PyArgumentList
-            wrapped_class = _wrap(obj=obj.__class__,
-                                  wrapper=wrapper,
-                                  methods_to_add=methods_to_add,
-                                  name=wrapped_class_name,
-                                  skip=skip,
-                                  wrap_return_values=wrap_return_values,
-                                  wrapped_name_func=wrapped_name_func,
-                                  wrapped=wrapped.__class__,
-                                  wrapping_scope_regex=wrapping_scope_regex)
-            object.__setattr__(wrapped, '__class__', wrapped_class)
-        return wrapped
+# noinspection PyShadowingNames
+def _is_magic_name(name):
+    return name.startswith('__') and name.endswith('__')
 
-    def wrap_return_values_(result):
-        if wrap_return_values:
-            # noinspection PyArgumentList
-            result = _wrap(obj=result,
-                           wrapper=wrapper,
-                           methods_to_add=methods_to_add,
-                           name=get_name(result, 'result'),
-                           skip=skip,
-                           wrap_return_values=wrap_return_values,
-                           wrapped_name_func=wrapped_name_func,
-                           wrapping_scope_regex=wrapping_scope_regex)
-        return result
 
-    # noinspection PyShadowingNames
-    def is_magic_name(name):
-        return name.startswith('__') and name.endswith('__')
+def _is_magic(obj):
+    return _is_magic_name(name=obj.__name__)
 
-    # noinspection PyShadowingNames
-    def is_magic(obj):
-        return is_magic_name(name=obj.__name__)
 
-    # noinspection PyShadowingNames
-    def is_coroutine_function(obj, wrapper):
-        return inspect.iscoroutinefunction(object=wrapper(obj)) and not is_magic(obj=obj)
+# The interpreter requires return values of these magic methods to be of particular types (or NotImplemented), so they
+# are never wrapped
+_MAGIC_NAMES_WITH_PROTOCOL_RESULTS = frozenset([
+    '__bool__', '__bytes__', '__complex__', '__dir__', '__eq__', '__float__', '__format__', '__fspath__', '__ge__',
+    '__getstate__', '__gt__', '__hash__', '__index__', '__init__', '__init_subclass__', '__instancecheck__', '__int__',
+    '__le__', '__len__', '__length_hint__', '__lt__', '__ne__', '__reduce__', '__reduce_ex__', '__repr__',
+    '__sizeof__', '__str__', '__subclasscheck__', '__subclasshook__',
+])
 
-    # noinspection PyShadowingNames
-    def wrap_call_and_wrap_return_values(obj, wrapper):
-        if is_coroutine_function(obj=obj, wrapper=wrapper):
-            # noinspection PyShadowingNames
-            @wraps(obj)
-            async def wrapper(*args, **kwargs):
-                return wrap_return_values_(result=await obj(*args, **kwargs))
-        else:
-            # noinspection PyShadowingNames
-            @wraps(obj)
-            def wrapper(*args, **kwargs):
-                return wrap_return_values_(result=obj(*args, **kwargs))
-        return wrapper
 
-    def function_or_method_wrapper():
-        # noinspection PyShadowingNames
-        @wraps(obj)
-        def wrapped_obj(*args, **kwargs):
-            return wrapper(obj)(*args, **kwargs)
+def _get_obj_type(obj):
+    if inspect.ismodule(obj):
+        result = ObjectType.MODULE
+    elif inspect.isclass(obj):
+        result = ObjectType.CLASS
+    elif (inspect.isbuiltin(obj) or
+          inspect.isfunction(obj) or
+          inspect.ismethod(obj) or
+          inspect.ismethoddescriptor(obj) or
+          isinstance(obj, MethodWrapper)):
+        result = ObjectType.FUNCTION_OR_METHOD
+    elif inspect.iscoroutine(obj):
+        result = ObjectType.COROUTINE
+    else:
+        result = ObjectType.OBJECT
+    return result
 
-        @wraps(obj)
-        def obj_with_original_obj_as_self(*args, **kwargs):
-            if len(args) > 0 and isinstance(args[0], Proxy):
-                # noinspection PyProtectedMember
-                args = (object.__getattribute__(args[0], '_original_obj'), ) + args[1:]
-            return obj(*args, **kwargs)
 
-        if wrapper is None:
-            result = obj
-        elif is_magic(obj=obj):
-            if obj.__name__ == '__getattribute__':
-                @wraps(obj)
-                def result(*args, **kwargs):
-                    # If we are trying to access magic attribute, call obj with args[0]._original_obj as self,
-                    # else call original __getattribute__ and wrap the result before returning it.
-                    # noinspection PyShadowingNames
-                    name = args[1]
-                    attr_value = obj_with_original_obj_as_self(*args, **kwargs)
-                    if is_magic_name(name=name):
-                        return attr_value
-                    else:
-                        # noinspection PyShadowingNames,PyArgumentList
-                        return _wrap(obj=attr_value,
-                                     wrapper=wrapper,
-                                     methods_to_add=methods_to_add,
-                                     name=name,
-                                     skip=skip,
-                                     wrap_return_values=wrap_return_values,
-                                     wrapped_name_func=wrapped_name_func,
-                                     wrapping_scope_regex=wrapping_scope_regex)
-            else:
-                result = obj_with_original_obj_as_self
-        elif obj.__name__ == '__getattr__':
-            @wraps(obj)
-            def result(*args, **kwargs):
-                return wrapper(obj(*args, **kwargs))
+def _get_module_name(obj):
+    if inspect.ismodule(obj):
+        return obj.__name__
+    module_name = getattr(obj, '__module__', None)
+    if isinstance(module_name, str):
+        return module_name
+    if inspect.iscode(obj) or inspect.isframe(obj) or inspect.istraceback(obj):
+        module = inspect.getmodule(obj)
+        return module.__name__ if module else ""
+    if inspect.isroutine(obj) or isinstance(obj, MethodWrapper):
+        # inspect.getmodule cannot find the module of routines without __module__ either
+        return ""
+    # Instances of built-in types have no __module__, so they are attributed to the module of their type
+    return _get_module_name(type(obj))
+
+
+def _get_library_name(module_name):
+    if module_name:
+        return module_name.partition(".")[0]
+    return ""
+
+
+class WrappingScope:
+    """
+    Matcher of names of modules, which objects should be wrapped
+
+    A scope either contains the modules of the given top-level packages (checked by a set lookup, regardless of the
+    number of packages), or the modules, which names fully match the regex (compiled once). Results are cached per
+    module name.
+    """
+
+    def __init__(self, regex=None, top_level_names=None):
+        """
+        :param Optional[str] regex: regex for module names that should be wrapped
+        :param Optional[Collection[str]] top_level_names: Names of top-level packages, which modules should be wrapped
+        :raise ValueError: If both `regex` and `top_level_names` are passed
+        """
+        if regex is not None and top_level_names is not None:
+            raise ValueError("only one of regex and top_level_names can be passed")
+        self.regex = None if regex is None else re.compile(regex)
+        self.top_level_names = None if top_level_names is None else frozenset(top_level_names)
+        self._matches = {}
+        # Scopes are parts of keys of wrapped objects cache, which are hashed on every lookup
+        self._hash = hash(self._key())
+
+    def _key(self):
+        return self.regex, self.top_level_names
+
+    def __eq__(self, other):
+        if not isinstance(other, WrappingScope):
+            return NotImplemented
+        return self._key() == other._key()
+
+    def __hash__(self):
+        return self._hash
+
+    def __repr__(self):
+        if self.top_level_names is not None:
+            return f'{self.__class__.__name__}(top_level_names={sorted(self.top_level_names)!r})'
+        return f'{self.__class__.__name__}(regex={None if self.regex is None else self.regex.pattern!r})'
+
+    def __contains__(self, module_name):
+        try:
+            return self._matches[module_name]
+        except KeyError:
+            pass
+        if self.top_level_names is not None:
+            result = module_name.partition('.')[0] in self.top_level_names
+        elif self.regex is not None:
+            result = self.regex.fullmatch(module_name) is not None
         else:
-            result = wrapped_obj
-        if wrap_return_values:
-            result = wrap_call_and_wrap_return_values(obj=result, wrapper=wrapper)
+            result = True
+        self._matches[module_name] = result
         return result
 
-    def coroutine_wrapper():
-        @wraps(obj)
-        async def result(*args, **kwargs):
-            return await wrapper(obj)(*args, **kwargs)
 
-        if wrap_return_values:
-            result = wrap_call_and_wrap_return_values(obj=result, wrapper=wrapper)
-        return result
+def _get_default_wrapping_scope(*objs):
+    # The libraries of all `objs` are wrapped, the standard library is wrapped as a whole
+    stdlib_top_level_module_names = _get_stdlib_top_level_module_names()
+    top_level_names = set()
+    for obj in objs:
+        library_name = _get_library_name(_get_module_name(obj))
+        if library_name in stdlib_top_level_module_names:
+            top_level_names |= stdlib_top_level_module_names
+        elif library_name:
+            top_level_names.add(library_name)
+        else:
+            return WrappingScope()
+    return WrappingScope(top_level_names=top_level_names)
 
-    def is_in_skip():
-        result = False
-        for s in skip:
-            if isinstance(s, str):
-                if name == s:
-                    result = True
-            elif isinstance(s, type):
-                if isinstance(obj, s):
-                    result = True
-            else:
-                if obj == s:
-                    result = True
-        return result
 
-    methods_to_add = frozenset(methods_to_add)
-    skip = frozenset(skip)
+# noinspection PyShadowingNames
+def _get_original_obj_name(obj):
+    _ = obj
+    return '_original_obj'
 
-    if wrapped_name_func is None:
-        # noinspection PyShadowingNames
-        def wrapped_name_func(obj):
-            _ = obj
-            return '_original_obj'
 
-    name = get_name(name, obj)
-    if name is None:
-        raise ValueError("name was not passed and obj.__name__ not found")
+def _call_with_original_obj_as_self(obj):
+    @wraps(obj)
+    def obj_with_original_obj_as_self(*args, **kwargs):
+        if len(args) > 0 and isinstance(args[0], Proxy):
+            # noinspection PyProtectedMember
+            args = (object.__getattribute__(args[0], '_original_obj'), ) + args[1:]
+        return obj(*args, **kwargs)
 
-    key = make_key(
-        obj=obj,
-        wrapper=wrapper,
-        methods_to_add=methods_to_add,
-        name=name,
-        skip=skip,
-        wrap_return_values=wrap_return_values,
-        wrapped_name_func=wrapped_name_func,
-        wrapping_scope_regex=wrapping_scope_regex,
-    )
+    return obj_with_original_obj_as_self
 
-    def get_module_name():
-        module = inspect.getmodule(obj)
-        if module:
-            return module.__name__
-        return ""
 
-    def get_library_name(module_name):
-        if module_name:
-            return module_name.partition(".")[0]
-        return ""
+def _is_same_attr_value(attr_value, cached_attr_value):
+    if attr_value is cached_attr_value:
+        return True
+    # Bound methods are created on every access
+    return (type(attr_value) is types.MethodType and type(cached_attr_value) is types.MethodType and
+            attr_value.__func__ is cached_attr_value.__func__ and attr_value.__self__ is cached_attr_value.__self__)
 
-    def get_default_wrapping_scope_regex():
-        module_name = get_module_name()
-        if module_name in STDLIB_MODULE_NAMES:
-            return STDLIB_MODULE_NAMES_REGEX
-        else:
-            library_name = get_library_name(module_name)
-            return rf"{library_name}(\..*)?" if library_name else ".*"
 
-    wrapping_scope_regex = wrapping_scope_regex or get_default_wrapping_scope_regex()
+# State of abstract base classes, which class proxies (subclasses of the originals) get on creation, since
+# `isinstance` checks on the original classes visit the state of their subclasses
+_ABC_STATE_NAMES = frozenset(['_abc_impl', '_abc_registry', '_abc_cache', '_abc_negative_cache',
+                              '_abc_negative_cache_version'])
 
-    # noinspection PyUnusedLocal
-    members = []
-    with suppress(ModuleNotFoundError):
-        members = getmembers(object=obj)
 
-    try:
-        already_wrapped = key in _wrapped_objs
-    except TypeError:
-        already_wrapped = False
-    module_name = get_module_name()
-    if not (not module_name or re.fullmatch(wrapping_scope_regex, get_module_name())) or is_in_skip():
-        wrapped = obj
-    elif already_wrapped:
-        wrapped = _wrapped_objs[key]
-    elif members:
-        wrapped = wrap_(obj=obj, name=name, members=members, wrapped=wrapped)
-    else:
-        wrapped = obj
-        _wrapped_objs[key] = wrapped
+def _need_to_wrap(attr_name):
+    if not _is_magic_name(name=attr_name):
+        return attr_name not in _ABC_STATE_NAMES
+    # Proxies don't own their originals, so collecting a proxy must not finalize (e.g. close) the original
+    return attr_name not in ['__class__', '__new__', '__del__']
 
-    return wrapped
 
+def _is_raising_exception(attr_value):
+    return isinstance(attr_value, tuple) and len(attr_value) > 0 and attr_value[0] == RAISES_EXCEPTION
 
-def wrap(obj, wrapper=None, methods_to_add=(), name=None, skip=(), wrap_return_values=False, clear_cache=True,
-         wrapping_scope_regex=None):
+
+def _raising_property(exception):
+    def raise_exception(self):
+        _ = self
+        raise exception
+    return property(raise_exception)
+
+
+# Result of the wrapping in progress, which is not known yet
+_NO_RESULT = object()
+
+
+class _WrappingInProgress:
+    """Object, which is being wrapped by a thread (with the threads of the pools it started)"""
+
+    __slots__ = ('owner', 'result', 'done')
+
+    def __init__(self, owner):
+        self.owner = owner
+        # The proxy, which is not finished until `done` is set
+        self.result = _NO_RESULT
+        self.done = threading.Event()
+
+
+class _ConfigurationKey(tuple):
+    """Tuple, which hash is computed once"""
+
+    def __new__(cls, *args):
+        self = super().__new__(cls, args)
+        self._hash = tuple.__hash__(self)
+        return self
+
+    def __hash__(self):
+        return self._hash
+
+
+class _CallStatisticsEntry:
+    __slots__ = ('count', 'exceptions', 'total', 'max', 'bucket_counts', 'pending_durations', 'recorders')
+
+    def __init__(self, n_buckets):
+        self.bucket_counts = [0] * n_buckets
+        # Durations of calls are appended here (appending to an array is atomic and stores no objects) and aggregated
+        # when the statistics are read
+        self.pending_durations = array('d')
+        self.recorders = None
+        self.clear()
+
+    def clear(self):
+        self.count = 0
+        self.exceptions = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.bucket_counts[:] = [0] * len(self.bucket_counts)
+        del self.pending_durations[:]
+
+
+def _escape_label_value(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class CallStatistics:
     """
-    Wrap module, class, function or another variable recursively
+    Collector of call counts, durations and exceptions of wrapped functions and methods by qualified names
 
-    :param Any obj: Object to wrap recursively
-    :param Optional[Callable] wrapper: Wrapper to wrap functions and methods in (accepts function as argument)
-    :param Collection[Callable] methods_to_add: Container of functions, which accept class as argument, and return \
-    tuple of method name and method to add to all classes
-    :param Optional[str] name: Name of module to wrap to (if `obj` is module)
-    :param Collection[Union[str, type, Any]] skip: Items to skip wrapping (if an item of a collection is the str, wrap \
-    will check the obj name, if an item of a collection is the type, wrap will check the obj type, else wrap will \
-    check an item itself)
-    :param bool wrap_return_values: If try, wrap return values of callables (only types, supported by wrap function \
-    are supported)
-    :param bool clear_cache: Clear wrapped objects cache after wrapping
-    :param Optional[str] wrapping_scope_regex: regex for module names that should be wrapped
+    Durations are counted in histogram buckets with fixed bounds, percentiles are estimated by bucket bounds. Calls
+    are only appended to an array (8 bytes per call) when they are recorded, and aggregated when the statistics are
+    read, so that recording a call costs two `perf_counter` calls and an append. Long-running processes should read
+    the statistics periodically. The collector is thread-safe.
+    """
+
+    DEFAULT_BUCKETS = (
+        1e-6, 2.5e-6, 5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4, 1e-3, 2.5e-3, 5e-3, 0.01, 0.025, 0.05, 0.1, 0.25,
+        0.5, 1.0, 2.5, 5.0, 10.0,
+    )
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        """
+        :param Collection[float] buckets: Upper bounds of duration histogram buckets in seconds
+        """
+        self.buckets = tuple(sorted(buckets))
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def record(self, name, duration, exception=None):
+        """
+        Record a call
+
+        :param str name: Qualified name of the called function
+        :param float duration: Duration of the call in seconds
+        :param Optional[BaseException] exception: Exception raised by the call
+        """
+        record_call, record_exception = self._get_recorders(name=name)
+        if exception is None:
+            record_call(duration)
+        else:
+            record_exception(duration, exception)
+
+    def _get_recorders(self, name):
+        # Returns the functions to record the duration of a call and the duration of a call, which raised the exception
+        with suppress(KeyError):
+            return self._entries[name].recorders
+        with self._lock:
+            with suppress(KeyError):
+                return self._entries[name].recorders
+            entry = _CallStatisticsEntry(n_buckets=len(self.buckets) + 1)
+            entry.recorders = entry.pending_durations.append, partial(self._record_exception, entry)
+            self._entries[name] = entry
+            return entry.recorders
+
+    def _record_exception(self, entry, duration, exception):
+        _ = exception
+        entry.pending_durations.append(duration)
+        with self._lock:
+            entry.exceptions += 1
+
+    def _aggregate(self, entry):
+        with self._lock:
+            # Calls recorded concurrently are appended after the copied ones, so they are kept
+            durations = entry.pending_durations[:]
+            del entry.pending_durations[:len(durations)]
+            buckets = self.buckets
+            bucket_counts = entry.bucket_counts
+            for duration in durations:
+                bucket_counts[bisect_left(buckets, duration)] += 1
+            if durations:
+                entry.count += len(durations)
+                entry.total += sum(durations)
+                entry.max = max(entry.max, max(durations))
+
+    def _aggregate_all(self):
+        with self._lock:
+            entries = list(self._entries.values())
+        for entry in entries:
+            self._aggregate(entry)
+
+    def clear(self):
+        """Forget all recorded calls"""
+        with self._lock:
+            # Entries are kept, since their recorders are used by wrapped functions
+            for entry in self._entries.values():
+                entry.clear()
+
+    def _percentile(self, entry, fraction):
+        rank = fraction * entry.count
+        cumulative_count = 0
+        for bucket, bucket_count in zip(self.buckets, entry.bucket_counts):
+            cumulative_count += bucket_count
+            if cumulative_count >= rank:
+                return min(bucket, entry.max)
+        return entry.max
+
+    def as_dict(self):
+        """
+        Return statistics of calls
+
+        :return: Dict of count, exceptions, total, mean, max, 50th, 90th and 99th percentile durations (in seconds) by \
+        qualified names of called functions
+        """
+        self._aggregate_all()
+        with self._lock:
+            return {
+                name: {
+                    'count': entry.count,
+                    'exceptions': entry.exceptions,
+                    'total_seconds': entry.total,
+                    'mean_seconds': entry.total / entry.count,
+                    'max_seconds': entry.max,
+                    'p50_seconds': self._percentile(entry=entry, fraction=0.5),
+                    'p90_seconds': self._percentile(entry=entry, fraction=0.9),
+                    'p99_seconds': self._percentile(entry=entry, fraction=0.99),
+                }
+                for name, entry in sorted(self._entries.items())
+                if entry.count
+            }
+
+    def to_prometheus(self, prefix='module_wrapper'):
+        """
+        Return statistics of calls in Prometheus text exposition format
+
+        :param str prefix: Prefix of metric names
+        :return: Counters of calls and exceptions and the histogram of durations labeled by function names
+        """
+        calls = [
+            f'# HELP {prefix}_calls_total Number of calls of wrapped functions',
+            f'# TYPE {prefix}_calls_total counter',
+        ]
+        exceptions = [
+            f'# HELP {prefix}_exceptions_total Number of calls of wrapped functions, which raised exceptions',
+            f'# TYPE {prefix}_exceptions_total counter',
+        ]
+        durations = [
+            f'# HELP {prefix}_call_duration_seconds Durations of calls of wrapped functions',
+            f'# TYPE {prefix}_call_duration_seconds histogram',
+        ]
+        self._aggregate_all()
+        with self._lock:
+            for name, entry in sorted(self._entries.items()):
+                if not entry.count:
+                    continue
+                label = f'function="{_escape_label_value(name)}"'
+                calls.append(f'{prefix}_calls_total{{{label}}} {entry.count}')
+                exceptions.append(f'{prefix}_exceptions_total{{{label}}} {entry.exceptions}')
+                cumulative_count = 0
+                for bucket, bucket_count in zip(self.buckets + (float('inf'), ), entry.bucket_counts):
+                    cumulative_count += bucket_count
+                    le = '+Inf' if bucket == float('inf') else repr(bucket)
+                    durations.append(f'{prefix}_call_duration_seconds_bucket{{{label},le="{le}"}} {cumulative_count}')
+                durations.append(f'{prefix}_call_duration_seconds_sum{{{label}}} {entry.total!r}')
+                durations.append(f'{prefix}_call_duration_seconds_count{{{label}}} {entry.count}')
+        return '\n'.join(calls + exceptions + durations) + '\n'
+
+
+# Collector of calls of functions wrapped with `instrument=True`
+call_statistics = CallStatistics()
+
+
+class _RecordingSuppress(suppress):
+    """`suppress`, which records suppressed exceptions to a report"""
+
+    def __init__(self, report, *exceptions):
+        super().__init__(*exceptions)
+        self._report = report
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        is_suppressed = super().__exit__(exc_type, exc_value, traceback)
+        if is_suppressed:
+            self._report.record_exception(exception=exc_value)
+        return is_suppressed
+
+
+class WrapReport:
+    """
+    Statistics of the wrapping process: what was visited, looked up, skipped and how long modules took to wrap
+
+    Counters:
+
+    * `objects_visited` - objects passed to wrapping (including the ones out of scope, skipped or cached)
+    * `getmembers_calls` - scans of members of modules and classes
+    * `cache_hits`, `cache_misses` - lookups in the cache of wrapped objects
+    * `scope_checks` - checks of module names against the wrapping scope
+    * `scope_evaluations` - checks, which evaluated the scope (the rest are memoized per module name)
+    * `out_of_scope` - objects, which were not wrapped since their modules are out of the wrapping scope
+    * `skipped` - objects, which were not wrapped since they matched `skip`
+    * `suppressed_exceptions` - exceptions raised by wrapping members, which were suppressed (the member is left \
+    unwrapped)
+
+    The report is thread-safe and can be shared by contexts.
+    """
+
+    COUNTERS = (
+        'objects_visited', 'getmembers_calls', 'cache_hits', 'cache_misses', 'scope_checks', 'scope_evaluations',
+        'out_of_scope', 'skipped', 'suppressed_exceptions',
+    )
+
+    def __init__(self):
+        self.counters = dict.fromkeys(self.COUNTERS, 0)
+        self.suppressed_exceptions_by_type = {}
+        self.module_seconds = {}
+        self._lock = threading.Lock()
+
+    def count(self, counter, value=1):
+        """
+        Increment a counter
+
+        :param str counter: Name of the counter (one of `COUNTERS`)
+        :param int value: Value to add
+        """
+        with self._lock:
+            self.counters[counter] += value
+
+    def record_exception(self, exception):
+        """
+        Record an exception suppressed by wrapping
+
+        :param BaseException exception: Suppressed exception
+        """
+        exception_type = _get_qualified_name(type(exception))
+        with self._lock:
+            self.counters['suppressed_exceptions'] += 1
+            self.suppressed_exceptions_by_type[exception_type] = \
+                self.suppressed_exceptions_by_type.get(exception_type, 0) + 1
+
+    def record_module_time(self, module_name, seconds):
+        """
+        Record the time of wrapping a module
+
+        :param str module_name: Name of the module
+        :param float seconds: Time of wrapping the module, including its submodules and members
+        """
+        with self._lock:
+            self.module_seconds[module_name] = self.module_seconds.get(module_name, 0.0) + seconds
+
+    def as_dict(self):
+        """
+        Return the report
+
+        :return: Dict of counters, counts of suppressed exceptions by type and wrapping times of modules in seconds \
+        (including their submodules, the slowest first)
+        """
+        with self._lock:
+            return {
+                **self.counters,
+                'suppressed_exceptions_by_type': dict(sorted(self.suppressed_exceptions_by_type.items(),
+                                                             key=lambda item: item[1], reverse=True)),
+                'module_seconds': dict(sorted(self.module_seconds.items(), key=lambda item: item[1], reverse=True)),
+            }
+
+
+_REGEX_TYPE = type(re.compile(''))
+
+
+def _is_function_matching(func, pattern):
+    if isinstance(pattern, str):
+        qualified_name = _get_qualified_name(func)
+        return fnmatchcase(qualified_name, pattern) or fnmatchcase(getattr(func, '__name__', qualified_name), pattern)
+    elif isinstance(pattern, _REGEX_TYPE):
+        return pattern.fullmatch(_get_qualified_name(func)) is not None
+    return pattern is func
+
+
+class ExecutorWrapper:
+    """
+    Wrapper, which turns functions into coroutine functions running them in executors (see the aioify example)
+
+    Calls are submitted to a thread pool or a process pool (chosen per function by routing rules), at most
+    `max_concurrency` calls per event loop are submitted at once, the rest wait without occupying the executor.
+    Functions, which are measured to be cheaper than `inline_threshold`, are called right in the event loop, so that
+    they don't pay for an executor round-trip. Coroutine functions are returned as is.
+    """
+
+    THREAD = 'thread'
+    PROCESS = 'process'
+    INLINE = 'inline'
+    ROUTES = (THREAD, PROCESS, INLINE)
+
+    # Number of first calls of a function, which are timed to decide whether it is called inline
+    INLINE_SAMPLES = 8
+
+    def __init__(self, max_workers=None, max_process_workers=None, max_concurrency=None, routes=(),
+                 default_route=THREAD, inline_threshold=None, thread_executor=None, process_executor=None):
+        """
+        :param Optional[int] max_workers: Maximum number of threads of the thread pool
+        :param Optional[int] max_process_workers: Maximum number of processes of the process pool
+        :param Optional[int] max_concurrency: Maximum number of calls submitted to executors at once per event loop \
+        (unbounded if None)
+        :param Union[Mapping[Any, str], Iterable[Tuple[Any, str]]] routes: Routes (`THREAD`, `PROCESS` or `INLINE`) \
+        by patterns, the first matching pattern is used (if a pattern is the str, it is matched against the qualified \
+        name and the name of the function with `fnmatch`, if it is the compiled regex, the qualified name should \
+        fully match it, else the function itself is checked whether it is the pattern), functions called in processes \
+        and their arguments must be picklable
+        :param str default_route: Route of functions, which match no patterns
+        :param Optional[float] inline_threshold: Functions routed to threads, which first `INLINE_SAMPLES` calls take \
+        less seconds than this, are called inline afterwards (never if None)
+        :param Optional[concurrent.futures.Executor] thread_executor: Executor to use instead of the thread pool
+        :param Optional[concurrent.futures.Executor] process_executor: Executor to use instead of the process pool
+        :raise ValueError: If a route is unknown
+        """
+        self.max_workers = max_workers
+        self.max_process_workers = max_process_workers
+        self.max_concurrency = max_concurrency
+        self.routes = tuple(routes.items() if hasattr(routes, 'items') else routes)
+        self.default_route = default_route
+        for route in [default_route] + [route for _, route in self.routes]:
+            if route not in self.ROUTES:
+                raise ValueError(f"route must be one of {self.ROUTES}, not {route!r}")
+        self.inline_threshold = inline_threshold
+        self._executors = {self.THREAD: thread_executor, self.PROCESS: process_executor}
+        self._owned_executors = []
+        self._semaphores = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def get_route(self, func):
+        """
+        Return the route of `func`
+
+        :param Callable func: Function
+        :return: `THREAD`, `PROCESS` or `INLINE`
+        """
+        for pattern, route in self.routes:
+            if _is_function_matching(func=func, pattern=pattern):
+                return route
+        return self.default_route
+
+    def _get_executor(self, route):
+        executor = self._executors[route]
+        if executor is not None:
+            return executor
+        with self._lock:
+            executor = self._executors[route]
+            if executor is None:
+                from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+                if route == self.THREAD:
+                    executor = ThreadPoolExecutor(max_workers=self.max_workers)
+                else:
+                    executor = ProcessPoolExecutor(max_workers=self.max_process_workers)
+                self._executors[route] = executor
+                self._owned_executors.append(executor)
+            return executor
+
+    def _get_semaphore(self, loop):
+        # Semaphores can't be shared by event loops
+        try:
+            return self._semaphores[loop]
+        except KeyError:
+            pass
+        import asyncio
+
+        with self._lock:
+            return self._semaphores.setdefault(loop, asyncio.Semaphore(self.max_concurrency))
+
+    def shutdown(self, wait=True):
+        """
+        Shut down the pools created by the wrapper (executors passed to it are left running)
+
+        :param bool wait: Wait for the pending calls to finish
+        """
+        with self._lock:
+            owned_executors, self._owned_executors = self._owned_executors, []
+            for route, executor in self._executors.items():
+                if executor in owned_executors:
+                    self._executors[route] = None
+        for executor in owned_executors:
+            executor.shutdown(wait=wait)
+
+    def __call__(self, func):
+        """
+        Wrap `func`
+
+        :param Callable func: Function to wrap
+        :return: Coroutine function, which calls `func` according to its route
+        """
+        if inspect.iscoroutinefunction(func):
+            return func
+        import asyncio
+
+        route = self.get_route(func)
+        if route == self.INLINE:
+            @wraps(func)
+            async def run_inline(*args, **kwargs):
+                return func(*args, **kwargs)
+
+            return run_inline
+
+        get_executor = self._get_executor
+        get_semaphore = None if self.max_concurrency is None else self._get_semaphore
+        # Durations of the first calls, None when it is decided whether the function is called inline
+        samples = [] if self.inline_threshold is not None and route == self.THREAD else None
+        inline_threshold = self.inline_threshold
+        inline_samples = self.INLINE_SAMPLES
+        is_inline = False
+
+        def call_timed(*args, **kwargs):
+            nonlocal samples, is_inline
+            start = perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                duration = perf_counter() - start
+                # Read once, since another thread can finish sampling in the meantime
+                current_samples = samples
+                if current_samples is not None:
+                    current_samples.append(duration)
+                    if len(current_samples) >= inline_samples:
+                        # Functions, which are sometimes slow, are kept in the executor
+                        is_inline = max(current_samples) < inline_threshold
+                        samples = None
+
+        @wraps(func)
+        async def run(*args, **kwargs):
+            if is_inline:
+                return func(*args, **kwargs)
+            loop = asyncio.get_event_loop()
+            call = partial(func if samples is None else call_timed, *args, **kwargs)
+            if get_semaphore is None:
+                return await loop.run_in_executor(get_executor(route), call)
+            async with get_semaphore(loop):
+                return await loop.run_in_executor(get_executor(route), call)
+
+        return run
+
+
+class BatchingWrapper:
+    """
+    Wrapper, which turns functions into coroutine functions coalescing concurrent calls into calls of bulk functions
+
+    Calls of a function, which has a bulk implementation, made within `window` seconds of the first one (or until
+    there are `max_batch_size` of them) in the same event loop are passed to the bulk implementation at once, and each
+    caller gets its own result. Functions without bulk implementations are wrapped in `wrapper` only.
+    """
+
+    def __init__(self, bulk_hooks=(), max_batch_size=64, window=0.001, wrapper=None):
+        """
+        :param Collection[Callable] bulk_hooks: Container of functions, which accept function as argument, and return \
+        its bulk implementation or None, the bulk implementation accepts the list of `(args, kwargs)` tuples of the \
+        calls and returns (or returns an awaitable of) the sequence of their results in the same order, an exception \
+        instance as a result is raised to its caller
+        :param int max_batch_size: Maximum number of calls passed to the bulk implementation at once
+        :param float window: Time to collect calls for in seconds since the first call of a batch
+        :param Optional[Callable] wrapper: Wrapper to wrap bulk implementations and functions without bulk \
+        implementations in, e.g. `ExecutorWrapper` (functions without bulk implementations are left as is if None)
+        :raise ValueError: If `max_batch_size` is not positive
+        """
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be positive")
+        self.bulk_hooks = tuple(bulk_hooks)
+        self.max_batch_size = max_batch_size
+        self.window = window
+        self.wrapper = wrapper
+
+    def get_bulk_implementation(self, func):
+        """
+        Return the bulk implementation of `func`
+
+        :param Callable func: Function
+        :return: Bulk implementation returned by the first hook, which returned it, None if there is no one
+        """
+        for bulk_hook in self.bulk_hooks:
+            bulk = bulk_hook(func)
+            if bulk is not None:
+                return bulk
+        return None
+
+    def __call__(self, func):
+        """
+        Wrap `func`
+
+        :param Callable func: Function to wrap
+        :return: Coroutine function, which calls the bulk implementation of `func`, `func` wrapped in `wrapper` if \
+        there is no bulk implementation
+        """
+        bulk = self.get_bulk_implementation(func)
+        if bulk is None:
+            return func if self.wrapper is None else self.wrapper(func)
+        import asyncio
+
+        dispatch = bulk if self.wrapper is None else self.wrapper(bulk)
+        max_batch_size = self.max_batch_size
+        window = self.window
+        # Calls (args, kwargs, future) waiting to be dispatched by event loops
+        batches = weakref.WeakKeyDictionary()
+        # Event loops only keep weak references to tasks
+        tasks = set()
+
+        async def dispatch_batch(calls):
+            try:
+                results = dispatch([(args, kwargs) for args, kwargs, _ in calls])
+                if inspect.isawaitable(results):
+                    results = await results
+                results = list(results)
+                if len(results) != len(calls):
+                    raise ValueError(f"bulk implementation of {_get_qualified_name(func)} returned {len(results)} "
+                                     f"results for {len(calls)} calls")
+            except Exception as exception:
+                results = [exception] * len(calls)
+            for (_, _, future), result in zip(calls, results):
+                # The caller could be cancelled
+                if future.done():
+                    continue
+                if isinstance(result, BaseException):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+
+        def start_dispatch(loop, calls):
+            # The batch could be dispatched already, since it reached the maximum size
+            if batches.get(loop) is not calls:
+                return
+            del batches[loop]
+            task = loop.create_task(dispatch_batch(calls))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+
+        @wraps(func)
+        async def call(*args, **kwargs):
+            loop = asyncio.get_event_loop()
+            future = loop.create_future()
+            calls = batches.get(loop)
+            if calls is None:
+                calls = batches[loop] = []
+                loop.call_later(window, start_dispatch, loop, calls)
+            calls.append((args, kwargs, future))
+            if len(calls) >= max_batch_size:
+                start_dispatch(loop, calls)
+            return await future
+
+        return call
+
+
+class MemoizingWrapper:
+    """
+    Wrapper, which caches return values of the selected functions by their arguments
+
+    The cache is shared by the functions wrapped by the wrapper, least recently used entries are evicted when there are
+    more than `maxsize` of them, and entries expire in `ttl` seconds. Concurrent awaits of a coroutine function with
+    the same arguments in the same event loop share one call. Calls with unhashable arguments and calls, which raise
+    exceptions, are not cached. The wrapper is thread-safe.
+    """
+
+    def __init__(self, patterns=(), maxsize=128, ttl=None, wrapper=None):
+        """
+        :param Collection[Any] patterns: Functions to memoize (if a pattern is the str, it is matched against the \
+        qualified name and the name of the function with `fnmatch`, if it is the compiled regex, the qualified name \
+        should fully match it, else the function itself is checked whether it is the pattern)
+        :param Optional[int] maxsize: Maximum number of cached results (unbounded if None)
+        :param Optional[float] ttl: Time to live of cached results in seconds (unlimited if None)
+        :param Optional[Callable] wrapper: Wrapper to wrap functions in before memoizing them, e.g. `ExecutorWrapper` \
+        (functions are left as is if None)
+        """
+        self.patterns = tuple(patterns)
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.wrapper = wrapper
+        # Values are tuples of expiration time (None if entries don't expire) and the result
+        self._entries = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._lock = threading.Lock()
+
+    def is_memoized(self, func):
+        """
+        Return whether results of `func` are memoized
+
+        :param Callable func: Function
+        :return: True if `func` matches any of the patterns
+        """
+        return any(_is_function_matching(func=func, pattern=pattern) for pattern in self.patterns)
+
+    def _get(self, key):
+        # Misses are counted by callers, since joining a call in progress is a hit
+        with self._lock:
+            expiration_time, result = self._entries[key]
+            if expiration_time is not None and expiration_time <= monotonic():
+                del self._entries[key]
+                raise KeyError(key)
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return result
+
+    def _set(self, key, result):
+        expiration_time = None if self.ttl is None else monotonic() + self.ttl
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = expiration_time, result
+            if self.maxsize is not None:
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+
+    def _count(self, hits=0, misses=0):
+        with self._lock:
+            self._hits += hits
+            self._misses += misses
+
+    def clear(self):
+        """Remove all cached results and reset statistics"""
+        with self._lock:
+            self._entries.clear()
+            self._hits = 0
+            self._misses = 0
+
+    def cache_info(self):
+        """
+        Return cache statistics
+
+        :return: Named tuple of hits, misses, maxsize and currsize
+        """
+        with self._lock:
+            return CacheInfo(hits=self._hits, misses=self._misses, maxsize=self.maxsize, currsize=len(self._entries))
+
+    def __call__(self, func):
+        """
+        Wrap `func`
+
+        :param Callable func: Function to wrap
+        :return: Function, which returns cached results of `func` wrapped in `wrapper` if `func` is memoized, \
+        `func` wrapped in `wrapper` otherwise
+        """
+        wrapped = func if self.wrapper is None else self.wrapper(func)
+        if not self.is_memoized(func):
+            return wrapped
+        # Identifies results of `func` in the shared cache, unlike the id of `func`, it is never reused
+        token = object()
+        get = self._get
+        set_ = self._set
+        count = self._count
+
+        if not inspect.iscoroutinefunction(wrapped):
+            @wraps(func)
+            def memoized(*args, **kwargs):
+                key = token, args, tuple(kwargs.items())
+                try:
+                    return get(key)
+                except KeyError:
+                    pass
+                except TypeError:
+                    # Unhashable arguments
+                    return wrapped(*args, **kwargs)
+                count(misses=1)
+                result = wrapped(*args, **kwargs)
+                set_(key, result)
+                return result
+
+            return memoized
+
+        import asyncio
+
+        # Futures of the callers waiting for the calls in progress by keys by event loops, since futures can't be shared
+        # by event loops
+        calls_by_loop = weakref.WeakKeyDictionary()
+        # Event loops only keep weak references to tasks
+        tasks = set()
+        lock = self._lock
+
+        def get_calls(loop):
+            calls = calls_by_loop.get(loop)
+            if calls is None:
+                with lock:
+                    calls = calls_by_loop.setdefault(loop, {})
+            return calls
+
+        async def call(calls, key, args, kwargs):
+            # Each caller waits for its own future, so that cancelling one of the callers does not cancel the call
+            # shared with the others
+            waiters = calls[key]
+            try:
+                result = await wrapped(*args, **kwargs)
+            except asyncio.CancelledError:
+                for waiter in waiters:
+                    waiter.cancel()
+                raise
+            except Exception as exception:
+                for waiter in waiters:
+                    if not waiter.done():
+                        waiter.set_exception(exception)
+            else:
+                set_(key, result)
+                for waiter in waiters:
+                    if not waiter.done():
+                        waiter.set_result(result)
+            finally:
+                del calls[key]
+                # Joining a call in progress is a hit, joins are counted at once
+                if len(waiters) > 1:
+                    count(hits=len(waiters) - 1)
+
+        @wraps(func)
+        async def memoized(*args, **kwargs):
+            key = token, args, tuple(kwargs.items())
+            loop = asyncio.get_event_loop()
+            calls = get_calls(loop)
+            try:
+                waiters = calls.get(key)
+            except TypeError:
+                # Unhashable arguments
+                return await wrapped(*args, **kwargs)
+            if waiters is None:
+                try:
+                    return get(key)
+                except KeyError:
+                    pass
+                count(misses=1)
+                waiters = calls[key] = []
+                task = loop.create_task(call(calls=calls, key=key, args=args, kwargs=kwargs))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            future = loop.create_future()
+            waiters.append(future)
+            return await future
+
+        return memoized
+
+
+def _get_qualified_name(obj):
+    module_name = getattr(obj, '__module__', None) or getattr(getattr(obj, '__objclass__', None), '__module__', None)
+    qualified_name = getattr(obj, '__qualname__', None) or _get_name(obj)
+    return f'{module_name}.{qualified_name}' if module_name else qualified_name
+
+
+class WrappingContext:
+    """
+    Wrapping session: configuration of wrapping and cache of wrapped objects
+
+    A context can be reused for many wrap calls (objects wrapped by it share proxies) and used concurrently from
+    multiple threads. Proxy classes and helper functions are created only for objects, which are actually wrapped, so
+    cache hits and objects out of the wrapping scope cost no allocations.
+    """
+
+    def __init__(
+            self,
+            wrapper=None,
+            methods_to_add=(),
+            skip=(),
+            wrap_return_values=False,
+            wrapped_name_func=None,
+            wrapping_scope_regex=None,
+            lazy=False,
+            cache=None,
+            workers=None,
+            instrument=None,
+            report=None,
+    ):
+        """
+        :param Optional[Callable] wrapper: Wrapper to wrap functions and methods in (accepts function as argument)
+        :param Collection[Callable] methods_to_add: Container of functions, which accept class as argument, and \
+        return tuple of method name and method to add to all classes
+        :param Collection[Union[str, type, Any]] skip: Items to skip wrapping (if an item of a collection is the str, \
+        wrap will check the obj name, if an item of a collection is the type, wrap will check the obj type, else wrap \
+        will check whether the obj is an item itself)
+        :param bool wrap_return_values: If try, wrap return values of callables (only types, supported by wrap \
+        function are supported)
+        :param Optional[Callable[Any, str]] wrapped_name_func: Function that accepts `obj` as argument and returns \
+        the name of wrapped `obj` that will be written into wrapped `obj`
+        :param Union[None, str, WrappingScope] wrapping_scope_regex: regex for module names that should be wrapped \
+        (or the scope itself), everything is wrapped if it is not passed
+        :param bool lazy: If true, wrap attributes of modules and classes on first access instead of wrapping them \
+        recursively in advance
+        :param Optional[WrappedObjectsCache] cache: Cache of wrapped objects (a new cache owned by the context is \
+        created if it is not passed)
+        :param Optional[int] workers: Number of threads to wrap sibling modules and classes in concurrently \
+        (everything is wrapped in the calling thread if it is not passed)
+        :param Union[None, bool, CallStatistics] instrument: Collector to record calls of wrapped functions and \
+        methods to (any object with the `record` method of `CallStatistics`), the global `call_statistics` if it is \
+        true
+        :param Optional[WrapReport] report: Report to record statistics of the wrapping process to
+        """
+        self.wrapper = wrapper
+        self.methods_to_add = frozenset(methods_to_add)
+        self.skip = frozenset(skip)
+        # Skip items are partitioned in advance, so that matching does not depend on the number of items and does not
+        # call `__eq__` of arbitrary objects
+        self._skip_names = frozenset(s for s in self.skip if isinstance(s, str))
+        self._skip_types = tuple(s for s in self.skip if isinstance(s, type))
+        self._skip_ids = frozenset(id(s) for s in self.skip if not isinstance(s, (str, type)))
+        self.wrap_return_values = wrap_return_values
+        self.wrapped_name_func = wrapped_name_func or _get_original_obj_name
+        if not isinstance(wrapping_scope_regex, WrappingScope):
+            wrapping_scope_regex = WrappingScope(regex=wrapping_scope_regex)
+        self.wrapping_scope = wrapping_scope_regex
+        self.lazy = lazy
+        self.cache = WrappedObjectsCache() if cache is None else cache
+        self.workers = workers
+        self.instrument = call_statistics if instrument is True else (instrument or None)
+        self.report = report
+        # The configuration is a part of cache keys, since a cache can be shared by contexts
+        self._key = _ConfigurationKey(
+            self.wrapper,
+            self.methods_to_add,
+            self.skip,
+            self.wrap_return_values,
+            self.wrapped_name_func,
+            self.wrapping_scope,
+            self.lazy,
+            self.instrument,
+        )
+        self._object_proxy_types = {}
+        # Objects and object proxy types, which are being wrapped, by their keys, and the owners of the wrapping, which
+        # wait for other owners to finish wrapping, by the waiting owners
+        self._objects_in_progress = {}
+        self._object_proxy_types_in_progress = {}
+        self._waits = {}
+        # Instances of object proxies only have the slots of `ObjectProxy`, unless something else is set on them
+        self._object_proxy_slots = \
+            ('__dict__', ) if self.methods_to_add or self.wrapped_name_func is not _get_original_obj_name else ()
+        self._new_instance_proxy_types = {}
+        self._class_members = {}
+        self._return_value_kinds = {}
+        self._unwrapped_return_value_types = set()
+        self._lock = threading.RLock()
+        # Marks the threads of the pools wrapping members concurrently, which wrap their subtrees sequentially, so that
+        # pool threads never wait for each other
+        self._thread_state = threading.local()
+
+    # noinspection PyShadowingNames
+    def _make_key(self, name):
+        return name, self._key
+
+    def clear(self):
+        """Clear the cache of wrapped objects and memoized members of classes"""
+        self.cache.clear()
+        with self._lock:
+            self._object_proxy_types.clear()
+            self._new_instance_proxy_types.clear()
+            self._class_members.clear()
+            self._return_value_kinds.clear()
+            self._unwrapped_return_value_types.clear()
+
+    def cache_info(self):
+        """
+        Return statistics of the cache of wrapped objects
+
+        :return: Named tuple of hits, misses, maxsize and currsize
+        """
+        return self.cache.cache_info()
+
+    def _is_in_scope(self, obj):
+        module_name = _get_module_name(obj)
+        if not module_name:
+            return True
+        if self.report is not None:
+            self.report.count('scope_checks')
+            # noinspection PyProtectedMember
+            if module_name not in self.wrapping_scope._matches:
+                self.report.count('scope_evaluations')
+        return module_name in self.wrapping_scope
+
+    def _suppress(self, *exceptions):
+        # Suppressed exceptions are recorded only if there is a report, since recording them costs more
+        if self.report is None:
+            return suppress(*exceptions)
+        return _RecordingSuppress(self.report, *exceptions)
+
+    # noinspection PyShadowingNames
+    def _is_in_skip(self, obj, name):
+        return name in self._skip_names or id(obj) in self._skip_ids or isinstance(obj, self._skip_types)
+
+    # noinspection PyShadowingNames
+    def wrap(self, obj, name=None, wrapped=None):
+        """
+        Wrap module, class, function or another variable recursively
+
+        :param Any obj: Object to wrap recursively
+        :param Optional[str] name: Name of module to wrap to (if `obj` is module)
+        :param Any wrapped: Object to wrap to
+        :return: Wrapped `obj`
+        """
+        name = _get_name(name, obj)
+        if name is None:
+            raise ValueError("name was not passed and obj.__name__ not found")
+
+        if self.report is not None:
+            return self._wrap_reported(obj=obj, name=name, wrapped=wrapped)
+        # Members are enumerated only for objects, which are really going to be wrapped
+        if not self._is_in_scope(obj=obj) or self._is_in_skip(obj=obj, name=name):
+            return obj
+        key = self._make_key(name=name)
+        with suppress(KeyError, TypeError):
+            return self.cache.get(obj=obj, key=key)
+        return self._wrap(obj=obj, name=name, key=key, wrapped=wrapped)
+
+    # noinspection PyShadowingNames
+    def _wrap_reported(self, obj, name, wrapped=None):
+        # The same as `wrap`, but the outcome is recorded to the report
+        self.report.count('objects_visited')
+        if not self._is_in_scope(obj=obj):
+            self.report.count('out_of_scope')
+            return obj
+        if self._is_in_skip(obj=obj, name=name):
+            self.report.count('skipped')
+            return obj
+        key = self._make_key(name=name)
+        with suppress(KeyError, TypeError):
+            result = self.cache.get(obj=obj, key=key)
+            self.report.count('cache_hits')
+            return result
+        self.report.count('cache_misses')
+        return self._wrap(obj=obj, name=name, key=key, wrapped=wrapped)
+
+    def wrap_many(self, objs, names=None):
+        """
+        Wrap modules, classes, functions or other variables recursively
+
+        Objects are wrapped in one pass, so their common members (e.g. submodules and base classes) are wrapped once.
+
+        :param Iterable[Any] objs: Objects to wrap recursively
+        :param Optional[Iterable[Optional[str]]] names: Names of modules to wrap to (in the order of `objs`)
+        :return: List of wrapped `objs` in the same order
+        """
+        objs = list(objs)
+        names = [None] * len(objs) if names is None else list(names)
+        if len(names) != len(objs):
+            raise ValueError("numbers of objs and names are different")
+        return [self.wrap(obj=obj, name=name) for obj, name in zip(objs, names)]
+
+    def _get_members(self, obj):
+        """Return members of module or class, members of classes are memoized until the classes are modified"""
+        is_class = inspect.isclass(obj)
+        if is_class:
+            with suppress(KeyError, TypeError):
+                snapshot, members = self._class_members[obj]
+                if _is_class_snapshot_valid(cls=obj, snapshot=snapshot):
+                    return members
+        if self.report is not None:
+            self.report.count('getmembers_calls')
+        members = list(iter_members(obj))
+        if is_class:
+            with suppress(TypeError):
+                self._class_members[obj] = _get_class_snapshot(cls=obj), members
+        return members
+
+    # noinspection PyShadowingNames
+    def _wrap(self, obj, name, key, wrapped=None):
+        obj_type = _get_obj_type(obj)
+        if self.report is None or obj_type != ObjectType.MODULE:
+            return self._wrap_object(obj=obj, name=name, key=key, wrapped=wrapped, obj_type=obj_type)
+        start = perf_counter()
+        try:
+            return self._wrap_object(obj=obj, name=name, key=key, wrapped=wrapped, obj_type=obj_type)
+        finally:
+            self.report.record_module_time(module_name=name, seconds=perf_counter() - start)
+
+    # noinspection PyShadowingNames
+    def _wrap_object(self, obj, name, key, wrapped, obj_type):
+        if obj_type in [ObjectType.FUNCTION_OR_METHOD, ObjectType.COROUTINE]:
+            if wrapped is None:
+                if obj_type == ObjectType.FUNCTION_OR_METHOD:
+                    wrapped = self._function_or_method_wrapper(obj=obj)
+                else:
+                    wrapped = self._coroutine_wrapper(obj=obj)
+            cached = self.cache.setdefault(obj=obj, key=key, wrapped=wrapped)
+            if cached is wrapped:
+                self._set_original_obj(obj=obj, obj_type=obj_type, wrapped=wrapped)
+            return cached
+        # The object is alive while it is being wrapped, so its id identifies it
+        progress_key = id(obj), key
+        entry, result = self._begin_wrapping(in_progress=self._objects_in_progress, key=progress_key)
+        if result is not _NO_RESULT:
+            return result
+        try:
+            result = self._wrap_module_class_or_object(obj=obj, name=name, key=key, wrapped=wrapped,
+                                                       obj_type=obj_type, entry=entry)
+        finally:
+            if entry is not None:
+                self._end_wrapping(in_progress=self._objects_in_progress, key=progress_key, entry=entry,
+                                   result=result)
+        return result
+
+    # noinspection PyShadowingNames
+    def _wrap_module_class_or_object(self, obj, name, key, wrapped, obj_type, entry):
+        # The proxy is cached when it is finished, so that other threads never get it before that
+        members = []
+        if obj_type in {ObjectType.MODULE, ObjectType.CLASS} and not self.lazy:
+            # In lazy mode members of modules and classes are looked up on first access
+            try:
+                members = self._get_members(obj=obj)
+            except ModuleNotFoundError:
+                pass
+            if not members:
+                return self.cache.setdefault(obj=obj, key=key, wrapped=obj)
+        if wrapped is None:
+            if obj_type == ObjectType.MODULE:
+                wrapped = self._create_proxy(proxy_type=ProxyType.MODULE, obj=obj, name=name)
+            elif obj_type == ObjectType.CLASS:
+                wrapped = self._create_proxy(proxy_type=ProxyType.CLASS, obj=obj, name=name)
+            else:
+                wrapped = self._create_proxy(proxy_type=ProxyType.OBJECT, obj=obj, name=name)
+        if entry is not None:
+            # Members, which refer to the object, get the proxy, which is not finished yet
+            entry.result = wrapped
+        self._set_original_obj(obj=obj, obj_type=obj_type, wrapped=wrapped)
+        self._add_methods(obj_type=obj_type, wrapped=wrapped)
+        self._wrap_members(obj=obj, obj_type=obj_type, members=members, wrapped=wrapped)
+        # Another thread could have wrapped the object in the meantime, if the wrapping was not registered
+        return self.cache.setdefault(obj=obj, key=key, wrapped=wrapped)
+
+    def _wrap_members(self, obj, obj_type, members, wrapped):
+        if obj_type == ObjectType.MODULE and self.lazy:
+            # Module attributes are wrapped on first access by LazyModuleProxy.__getattr__
+            pass
+        elif obj_type == ObjectType.CLASS and self.lazy:
+            self._wrap_class_members_lazily(obj=obj, wrapped=wrapped)
+        elif obj_type in {ObjectType.MODULE, ObjectType.CLASS}:
+            members = [(attr_name, attr_value) for attr_name, attr_value in members
+                       if _need_to_wrap(attr_name=attr_name)]
+            concurrent_members = []
+            if self.workers is not None and self.workers > 1 and not getattr(self._thread_state, 'is_worker', False):
+                # Modules and classes are wrapped with their members, so they are worth a thread, the rest of the
+                # members are wrapped right away
+                concurrent_members = [member for member in members if isinstance(member[1], (types.ModuleType, type))]
+            if len(concurrent_members) > 1:
+                from concurrent.futures import ThreadPoolExecutor
+
+                members = [member for member in members if not isinstance(member[1], (types.ModuleType, type))]
+                owner = self._get_owner()
+                with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                    futures = [executor.submit(self._wrap_and_set_member_in_worker, owner=owner, obj_type=obj_type,
+                                               wrapped=wrapped, attr_name=attr_name, attr_value=attr_value)
+                               for attr_name, attr_value in concurrent_members]
+                    for attr_name, attr_value in members:
+                        self._wrap_and_set_member(obj_type=obj_type, wrapped=wrapped, attr_name=attr_name,
+                                                  attr_value=attr_value)
+                    for future in futures:
+                        future.result()
+            else:
+                for attr_name, attr_value in members:
+                    self._wrap_and_set_member(obj_type=obj_type, wrapped=wrapped, attr_name=attr_name,
+                                              attr_value=attr_value)
+
+    # noinspection PyShadowingNames
+    def _wrap_and_set_member_in_worker(self, owner, obj_type, wrapped, attr_name, attr_value):
+        # The thread is marked by every task, since pools accept initializers only since Python 3.7
+        self._thread_state.is_worker = True
+        self._thread_state.owner = owner
+        self._wrap_and_set_member(obj_type=obj_type, wrapped=wrapped, attr_name=attr_name, attr_value=attr_value)
+
+    def _get_owner(self):
+        # Pool threads wrap members on behalf of the thread, which started the pool
+        return getattr(self._thread_state, 'owner', None) or threading.get_ident()
+
+    def _is_waiting_for(self, owner, other_owner):
+        owners = [owner]
+        visited_owners = set()
+        while owners:
+            owner = owners.pop()
+            if owner == other_owner:
+                return True
+            if owner not in visited_owners:
+                visited_owners.add(owner)
+                owners.extend(self._waits.get(owner, ()))
+        return False
+
+    def _begin_wrapping(self, in_progress, key, finished=None):
+        """
+        Register the wrapping of the object by the current thread, unless another thread is wrapping it
+
+        Other threads wait until the object is wrapped, recursion (and threads, which the owner of the wrapping waits
+        for) get the proxy, which is not finished yet.
+
+        :return: Tuple of the entry to pass to `_end_wrapping` (None if the wrapping is not registered) and the result \
+        of the wrapping (`_NO_RESULT` if the current thread should wrap the object)
+        """
+        owner = self._get_owner()
+        while True:
+            with self._lock:
+                if finished is not None and key in finished:
+                    return None, finished[key]
+                entry = in_progress.get(key)
+                if entry is None:
+                    entry = in_progress[key] = _WrappingInProgress(owner=owner)
+                    return entry, _NO_RESULT
+                if entry.owner == owner or self._is_waiting_for(owner=entry.owner, other_owner=owner):
+                    return None, entry.result
+                self._waits.setdefault(owner, []).append(entry.owner)
+            try:
+                entry.done.wait()
+            finally:
+                with self._lock:
+                    waits = self._waits[owner]
+                    waits.remove(entry.owner)
+                    if not waits:
+                        del self._waits[owner]
+            if entry.result is not _NO_RESULT:
+                return None, entry.result
+            # The wrapping has failed, so it is done again
+
+    def _end_wrapping(self, in_progress, key, entry, result, finished=None):
+        with self._lock:
+            entry.result = result
+            if finished is not None and result is not _NO_RESULT:
+                finished[key] = result
+            del in_progress[key]
+        entry.done.set()
+
+    # noinspection PyShadowingNames
+    def _wrap_and_set_member(self, obj_type, wrapped, attr_name, attr_value):
+        with self._suppress(AttributeError, TypeError):
+            attr_value_new = self._wrap_member(obj_type=obj_type, attr_name=attr_name, attr_value=attr_value)
+            self._set_member(obj_type=obj_type, wrapped=wrapped, attr_name=attr_name, attr_value_new=attr_value_new)
+
+    # noinspection PyShadowingNames
+    def _create_proxy(self, proxy_type, obj, name):
+        if proxy_type == ProxyType.MODULE:
+            if self.lazy:
+                result = LazyModuleProxy(name=name, wrapping_context=self, original_module=obj)
+            else:
+                result = ModuleProxy(name=name)
+        elif proxy_type == ProxyType.CLASS:
+            result = self._create_class_proxy(obj=obj, name=name)
+        else:
+            result = object.__new__(self._get_object_proxy_type(cls=obj.__class__))
+        return result
+
+    # noinspection PyShadowingNames
+    def _create_class_proxy(self, obj, name):
+        wrapping_context = self
+
+        # Subclassing from obj to pass isinstance(some_object, obj) checks
+        class ClassProxy(obj, Proxy):
+            @staticmethod
+            def __new__(cls, *args, **kwargs):
+                _ = cls
+                original_obj_object = obj(*args, **kwargs)
+                return wrapping_context._wrap_new_instance(obj=original_obj_object, cls=obj, name=name)
+
+        return ClassProxy
+
+    # noinspection PyShadowingNames
+    def _wrap_new_instance(self, obj, cls, name):
+        """
+        Wrap the instance of `cls` just created by its ClassProxy
+
+        The instance is new, so it can't be cached yet, and the wrapping scope and skip items matching the names and
+        the types of instances of `cls` are checked once per class, which leaves constant work per instance.
+        """
+        if type(obj) is not cls:
+            return self.wrap(obj=obj, name=name)
+        try:
+            object_proxy_type = self._new_instance_proxy_types[cls]
+        except KeyError:
+            object_proxy_type = self._new_instance_proxy_types.setdefault(
+                cls,
+                self._get_new_instance_proxy_type(obj=obj, cls=cls, name=name),
+            )
+        if object_proxy_type is None or (self._skip_ids and id(obj) in self._skip_ids):
+            return self.wrap(obj=obj, name=name)
+        wrapped = object.__new__(object_proxy_type)
+        if self.wrapped_name_func is _get_original_obj_name:
+            # The original object is only set to the slot
+            _set_original_obj_slot(wrapped, obj)
+        else:
+            self._set_original_obj(obj=obj, obj_type=ObjectType.OBJECT, wrapped=wrapped)
+        if self.methods_to_add:
+            self._add_methods(obj_type=ObjectType.OBJECT, wrapped=wrapped)
+        if self.wrap_return_values:
+            # Otherwise the instance is never looked up, since only return values can be the instances created by the
+            # proxies, so it is cached with the name, which `_wrap_return_value` looks it up by
+            self.cache.set(obj=obj, key=self._make_key(name=_get_name(obj, 'result')), wrapped=wrapped)
+        return wrapped
+
+    # noinspection PyShadowingNames
+    def _get_new_instance_proxy_type(self, obj, cls, name):
+        # Returns None if instances of `cls` need the generic wrapping path
+        if not self._is_in_scope(obj=obj) or self._is_in_skip(obj=obj, name=name):
+            return None
+        return self._get_object_proxy_type(cls=cls)
+
+    def _get_object_proxy_type(self, cls):
+        # Instances of the same class share one proxy class, which contains the wrapped members of the class
+        try:
+            return self._object_proxy_types[cls]
+        except KeyError:
+            pass
+        # The proxy type is published when its members are wrapped, other threads wait for it. The lock is not held
+        # while the members are wrapped, since wrapping them can wait for pool threads, which need it.
+        entry, object_proxy_type = self._begin_wrapping(in_progress=self._object_proxy_types_in_progress, key=cls,
+                                                        finished=self._object_proxy_types)
+        if object_proxy_type is not _NO_RESULT:
+            return object_proxy_type
+        try:
+            object_proxy_type = type('ObjectProxy', (ObjectProxy, ), {'__slots__': self._object_proxy_slots})
+            # The original class is not set on the proxy class, since it would shadow the slot of the original instance
+            if entry is not None:
+                entry.result = object_proxy_type
+            self._add_methods(obj_type=ObjectType.CLASS, wrapped=object_proxy_type)
+            members = []
+            if not self.lazy:
+                with suppress(ModuleNotFoundError):
+                    members = self._get_members(obj=cls)
+            self._wrap_members(obj=cls, obj_type=ObjectType.CLASS, members=members, wrapped=object_proxy_type)
+        finally:
+            if entry is not None:
+                self._end_wrapping(in_progress=self._object_proxy_types_in_progress, key=cls, entry=entry,
+                                   result=object_proxy_type, finished=self._object_proxy_types)
+        return object_proxy_type
+
+    def _set_original_obj(self, obj, obj_type, wrapped):
+        with suppress(AttributeError):
+            what = type if obj_type == ObjectType.CLASS else object
+            what.__setattr__(wrapped, self.wrapped_name_func(obj), obj)
+            if obj_type == ObjectType.OBJECT:
+                # Methods of classes unwrap `self` using this attribute
+                object.__setattr__(wrapped, '_original_obj', obj)
+
+    def _add_methods(self, obj_type, wrapped):
+        # Object proxies forward attribute writes to their originals, so the methods are set to their own `__dict__`
+        set_attr = object.__setattr__ if obj_type == ObjectType.OBJECT else setattr
+        for method_to_add in self.methods_to_add:
+            method_name, method = method_to_add(wrapped)
+            if method is not None:
+                set_attr(wrapped, method_name, method)
+
+    # noinspection PyShadowingNames
+    def _wrap_member(self, obj_type, attr_name, attr_value):
+        if _is_raising_exception(attr_value=attr_value) and not obj_type == ObjectType.MODULE:
+            attr_value = _raising_property(exception=attr_value[1])
+        return self.wrap(obj=attr_value, name=_get_name(attr_value, attr_name))
+
+    # noinspection PyShadowingNames
+    def _set_member(self, obj_type, wrapped, attr_name, attr_value_new):
+        with self._suppress(Exception):
+            base_type = {
+                ObjectType.MODULE: types.ModuleType,
+                ObjectType.CLASS: type,
+            }[obj_type]
+            base_type.__setattr__(wrapped, attr_name, attr_value_new)
+
+    def _wrap_class_members_lazily(self, obj, wrapped):
+        # Magic methods are looked up on the type by the interpreter, bypassing descriptors of the proxy, so wrap them
+        # right away, the rest of the attributes are wrapped on first access.
+        for attr_name in dir(obj):
+            if _need_to_wrap(attr_name=attr_name):
+                if _is_magic_name(name=attr_name):
+                    with self._suppress(AttributeError, TypeError):
+                        attr_value_new = self._wrap_member(obj_type=ObjectType.CLASS, attr_name=attr_name,
+                                                           attr_value=getmember(obj, attr_name))
+                        self._set_member(obj_type=ObjectType.CLASS, wrapped=wrapped, attr_name=attr_name,
+                                         attr_value_new=attr_value_new)
+                else:
+                    self._set_member(obj_type=ObjectType.CLASS, wrapped=wrapped, attr_name=attr_name,
+                                     attr_value_new=LazyAttribute(name=attr_name,
+                                                                  resolve=partial(self._resolve_lazy_member,
+                                                                                  obj,
+                                                                                  attr_name)))
+
+    def _resolve_lazy_member(self, obj, attr_name):
+        attr_value = getmember(obj, attr_name)
+        with self._suppress(AttributeError, TypeError):
+            return self._wrap_member(obj_type=ObjectType.CLASS, attr_name=attr_name, attr_value=attr_value)
+        return attr_value
+
+    def _wrap_return_value(self, result):
+        if not self.wrap_return_values:
+            return result
+        # How return values are wrapped is resolved once per type, so that e.g. items of a stream of tuples cost a
+        # dict lookup each
+        result_type = type(result)
+        kind = self._return_value_kinds.get(result_type)
+        if kind is _ReturnValueKind.UNWRAPPED:
+            return result
+        if kind is None:
+            kind = self._get_return_value_kind(result=result)
+            if kind is not None:
+                self._return_value_kinds[result_type] = kind
+                if kind is _ReturnValueKind.UNWRAPPED:
+                    self._unwrapped_return_value_types.add(result_type)
+                    return result
+        if kind is _ReturnValueKind.COROUTINE:
+            return self._await_and_wrap_return_value(awaitable=result)
+        name = _get_name(result, 'result')
+        if kind is _ReturnValueKind.ITERATOR or kind is _ReturnValueKind.ASYNC_ITERATOR:
+            if self._is_in_skip(obj=result, name=name):
+                return result
+            proxy_type = IteratorProxy if kind is _ReturnValueKind.ITERATOR else AsyncIteratorProxy
+            return proxy_type(original_obj=result, wrap_item=self._wrap_return_value,
+                              unwrapped_item_types=self._unwrapped_return_value_types)
+        return self.wrap(obj=result, name=name)
+
+    def _get_return_value_kind(self, result):
+        # Returns None if the kind can't be resolved by the type of `result`
+        result_type = type(result)
+        if result_type is types.CoroutineType:
+            return _ReturnValueKind.COROUTINE
+        if result_type is types.GeneratorType:
+            return _ReturnValueKind.ITERATOR
+        if result_type is types.AsyncGeneratorType:
+            return _ReturnValueKind.ASYNC_ITERATOR
+        # Instances, which module is the module of their type, are in the wrapping scope if and only if their type is
+        if (isinstance(result, (types.ModuleType, type, MethodWrapper)) or inspect.isroutine(result) or
+                _get_module_name(result) != getattr(result_type, '__module__', None)):
+            return None
+        if self._is_in_scope(obj=result):
+            return _ReturnValueKind.WRAPPED
+        # Iterators, which are not wrapped themselves (e.g. cursors of database drivers), are wrapped item by item,
+        # unless they are context managers, which proxies can't stand for
+        if hasattr(result_type, '__next__') and not hasattr(result_type, '__enter__'):
+            return _ReturnValueKind.ITERATOR
+        if hasattr(result_type, '__anext__') and not hasattr(result_type, '__aenter__'):
+            return _ReturnValueKind.ASYNC_ITERATOR
+        return _ReturnValueKind.UNWRAPPED
+
+    async def _await_and_wrap_return_value(self, awaitable):
+        return self._wrap_return_value(result=await awaitable)
+
+    def _wrap_call_and_wrap_return_values(self, obj):
+        wrap_return_value = self._wrap_return_value
+        if inspect.iscoroutinefunction(obj) and not _is_magic(obj=obj):
+            @wraps(obj)
+            async def wrapper(*args, **kwargs):
+                return wrap_return_value(result=await obj(*args, **kwargs))
+        else:
+            @wraps(obj)
+            def wrapper(*args, **kwargs):
+                return wrap_return_value(result=obj(*args, **kwargs))
+        return wrapper
+
+    def _instrument_call(self, obj, name):
+        # Return values are wrapped by the same function, so that a call adds a single frame
+        if isinstance(self.instrument, CallStatistics):
+            # Successful calls are recorded without calling Python functions
+            # noinspection PyProtectedMember
+            record_call, record_exception = self.instrument._get_recorders(name=name)
+        else:
+            record_call = record_exception = partial(self.instrument.record, name)
+        wrap_return_value = self._wrap_return_value if self.wrap_return_values else None
+
+        if inspect.iscoroutinefunction(obj):
+            @wraps(obj)
+            async def instrumented(*args, **kwargs):
+                start = perf_counter()
+                try:
+                    result = await obj(*args, **kwargs)
+                except BaseException as e:
+                    record_exception(perf_counter() - start, e)
+                    raise
+                record_call(perf_counter() - start)
+                return result if wrap_return_value is None else wrap_return_value(result=result)
+        else:
+            @wraps(obj)
+            def instrumented(*args, **kwargs):
+                start = perf_counter()
+                try:
+                    result = obj(*args, **kwargs)
+                except BaseException as e:
+                    record_exception(perf_counter() - start, e)
+                    raise
+                record_call(perf_counter() - start)
+                return result if wrap_return_value is None else wrap_return_value(result=result)
+        return instrumented
+
+    def _decorate(self, obj):
+        # The wrapper is applied once per wrapped function, the result is reused for every call. If the wrapper
+        # returned the function itself, it is wrapped in a new function, so that setting the original object on the
+        # wrapped function does not modify `obj`. Return values are wrapped by this function as well, so that a call
+        # adds a single frame.
+        decorated = obj if self.wrapper is None else self.wrapper(obj)
+        if self.instrument is not None:
+            return self._instrument_call(obj=decorated, name=_get_qualified_name(obj))
+        if self.wrap_return_values:
+            return self._wrap_call_and_wrap_return_values(obj=decorated)
+        if decorated is obj:
+            @wraps(obj)
+            def decorated(*args, **kwargs):
+                return obj(*args, **kwargs)
+        return decorated
+
+    def _getattribute_wrapper(self, obj):
+        wrapping_context = self
+        obj_with_original_obj_as_self = _call_with_original_obj_as_self(obj=obj)
+
+        @wraps(obj)
+        def result(self, name):
+            # Call obj with self._original_obj as self, and if we are not trying to access magic attribute, wrap the
+            # result before returning it.
+            # Wrapped values are memoized per proxy and reused while the original returns the same value, so that
+            # repeated reads do not wrap the value again. The memo is checked first, since it never contains magic
+            # attributes.
+            try:
+                original_obj = _get_original_obj_slot(self)
+            except TypeError:
+                # Not an object proxy (e.g. an instance of a subclass of a class proxy)
+                attr_value = obj_with_original_obj_as_self(self, name)
+                if _is_magic_name(name=name):
+                    return attr_value
+                return wrapping_context.wrap(obj=attr_value, name=name)
+            attr_value = obj(original_obj, name)
+            try:
+                wrapped_attributes = _get_wrapped_attributes_slot(self)
+            except AttributeError:
+                wrapped_attributes = None
+            else:
+                entry = wrapped_attributes.get(name)
+                if entry is not None and (attr_value is entry[0] or
+                                          _is_same_attr_value(attr_value=attr_value, cached_attr_value=entry[0])):
+                    return entry[1]
+            if _is_magic_name(name=name):
+                return attr_value
+            if wrapped_attributes is None:
+                # Created on first access, so that instances, which attributes are never read, don't pay for it
+                wrapped_attributes = {}
+                _set_wrapped_attributes_slot(self, wrapped_attributes)
+            attr_value_new = wrapping_context.wrap(obj=attr_value, name=name)
+            wrapped_attributes[name] = attr_value, attr_value_new
+            return attr_value_new
+
+        return result
+
+    @staticmethod
+    def _setattr_wrapper(obj):
+        obj_with_original_obj_as_self = _call_with_original_obj_as_self(obj=obj)
+
+        @wraps(obj)
+        def result(*args, **kwargs):
+            # Forget the wrapped value of the attribute, which is set or deleted
+            with suppress(AttributeError, IndexError, TypeError):
+                object.__getattribute__(args[0], '_wrapped_attributes').pop(args[1], None)
+            return obj_with_original_obj_as_self(*args, **kwargs)
+
+        return result
+
+    def _function_or_method_wrapper(self, obj):
+        wrapper = self.wrapper
+        if wrapper is None and self.instrument is None:
+            result = obj
+        elif _is_magic(obj=obj):
+            if obj.__name__ == '__getattribute__':
+                # Attribute values are wrapped by the __getattribute__ wrapper itself
+                return self._getattribute_wrapper(obj=obj)
+            elif obj.__name__ in ('__setattr__', '__delattr__'):
+                result = self._setattr_wrapper(obj=obj)
+            else:
+                result = _call_with_original_obj_as_self(obj=obj)
+        elif obj.__name__ == '__getattr__':
+            @wraps(obj)
+            def result(*args, **kwargs):
+                return wrapper(obj(*args, **kwargs))
+        else:
+            return self._decorate(obj=obj)
+        if self.wrap_return_values and obj.__name__ not in _MAGIC_NAMES_WITH_PROTOCOL_RESULTS:
+            result = self._wrap_call_and_wrap_return_values(obj=result)
+        return result
+
+    def _coroutine_wrapper(self, obj):
+        decorated = self.wrapper(obj)
+        if self.wrap_return_values:
+            wrap_return_value = self._wrap_return_value
+
+            @wraps(obj)
+            async def result(*args, **kwargs):
+                return wrap_return_value(result=await decorated(*args, **kwargs))
+        else:
+            @wraps(obj)
+            async def result(*args, **kwargs):
+                return await decorated(*args, **kwargs)
+        return result
+
+
+def wrap(obj, wrapper=None, methods_to_add=(), name=None, skip=(), wrap_return_values=False, clear_cache=True,
+         wrapping_scope_regex=None, lazy=False, cache=None, context=None, workers=None, instrument=None,
+         report=None):
+    """
+    Wrap module, class, function or another variable recursively
+
+    :param Any obj: Object to wrap recursively
+    :param Optional[Callable] wrapper: Wrapper to wrap functions and methods in (accepts function as argument)
+    :param Collection[Callable] methods_to_add: Container of functions, which accept class as argument, and return \
+    tuple of method name and method to add to all classes
+    :param Optional[str] name: Name of module to wrap to (if `obj` is module)
+    :param Collection[Union[str, type, Any]] skip: Items to skip wrapping (if an item of a collection is the str, wrap \
+    will check the obj name, if an item of a collection is the type, wrap will check the obj type, else wrap will \
+    check whether the obj is an item itself)
+    :param bool wrap_return_values: If try, wrap return values of callables (only types, supported by wrap function \
+    are supported)
+    :param bool clear_cache: Clear wrapped objects cache after wrapping (if false and neither `cache` nor `context` \
+    is passed, the global cache is used, so that the following wrap calls reuse the wrapped objects), `cache` passed \
+    by the caller is never cleared
+    :param Optional[str] wrapping_scope_regex: regex for module names that should be wrapped
+    :param bool lazy: If true, wrap attributes of modules and classes on first access instead of wrapping them \
+    recursively in advance (wrapping time scales with the number of used attributes, not with the size of `obj`)
+    :param Optional[WrappedObjectsCache] cache: Cache of wrapped objects to use instead of the global one (for \
+    example, with a size limit)
+    :param Optional[WrappingContext] context: Wrapping session to wrap `obj` in, if passed, the other wrapping \
+    parameters are taken from the context and its cache is never cleared
+    :param Optional[int] workers: Number of threads to wrap sibling modules and classes in concurrently (the result \
+    is the same as without threads, it only pays off if wrapping waits for I/O, e.g. for lazily imported submodules)
+    :param Union[None, bool, CallStatistics] instrument: Collector to record call counts, durations and exceptions of \
+    wrapped functions and methods to, the global `call_statistics` if it is true (with a wrapper, every call of a \
+    wrapped function pays for one more function call and two `perf_counter` calls)
+    :param Optional[WrapReport] report: Report to record statistics of the wrapping process to (objects visited, \
+    member scans, cache hits and misses, scope evaluations, skipped objects, suppressed exceptions and wrapping times \
+    of modules), e.g. to tune `skip` and `wrapping_scope_regex`
     :return: Wrapped `obj`
     """
-    result = _wrap(
-        obj=obj,
+    if context is not None:
+        return context.wrap(obj=obj, name=name)
+    if cache is None and not clear_cache:
+        cache = _wrapped_objs
+    wrapping_context = WrappingContext(
+        wrapper=wrapper,
+        methods_to_add=methods_to_add,
+        skip=skip,
+        wrap_return_values=wrap_return_values,
+        wrapping_scope_regex=wrapping_scope_regex or _get_default_wrapping_scope(obj),
+        lazy=lazy,
+        cache=cache,
+        workers=workers,
+        instrument=instrument,
+        report=report,
+    )
+    result = wrapping_context.wrap(obj=obj, name=name)
+    if clear_cache and cache is None:
+        # Caches passed by the caller are kept to be reused by the following calls
+        wrapping_context.clear()
+    return result
+
+
+def wrap_many(objs, wrapper=None, methods_to_add=(), names=None, skip=(), wrap_return_values=False, clear_cache=True,
+              wrapping_scope_regex=None, lazy=False, cache=None, context=None, workers=None, instrument=None,
+              report=None):
+    """
+    Wrap modules, classes, functions or other variables recursively with the same parameters
+
+    Unlike calling `wrap` for each object, the objects share the wrapping context, so members, which they have in
+    common (e.g. submodules and base classes), are wrapped once and are the same objects in the results.
+
+    :param Iterable[Any] objs: Objects to wrap recursively
+    :param Optional[Iterable[Optional[str]]] names: Names of modules to wrap to (in the order of `objs`)
+    :param Optional[str] wrapping_scope_regex: regex for module names that should be wrapped (libraries of all `objs` \
+    are wrapped if it is not passed)
+    :return: List of wrapped `objs` in the same order
+
+    The rest of the parameters are the same as in `wrap`.
+    """
+    objs = list(objs)
+    if context is not None:
+        return context.wrap_many(objs=objs, names=names)
+    if cache is None and not clear_cache:
+        cache = _wrapped_objs
+    wrapping_context = WrappingContext(
         wrapper=wrapper,
         methods_to_add=methods_to_add,
-        name=name,
         skip=skip,
         wrap_return_values=wrap_return_values,
-        wrapping_scope_regex=wrapping_scope_regex,
+        wrapping_scope_regex=wrapping_scope_regex or _get_default_wrapping_scope(*objs),
+        lazy=lazy,
+        cache=cache,
+        workers=workers,
+        instrument=instrument,
+        report=report,
     )
-    if clear_cache:
-        _wrapped_objs.clear()
+    result = wrapping_context.wrap_many(objs=objs, names=names)
+    if clear_cache and cache is None:
+        # Caches passed by the caller are kept to be reused by the following calls
+        wrapping_context.clear()
     return result
+
+
+class _WrappingLoader:
+    """Loader of the proxy of the original module, or of the empty package of the prefix if there is no one"""
+
+    # noinspection PyShadowingNames
+    def __init__(self, import_hook, original_name=None):
+        self.import_hook = import_hook
+        self.original_name = original_name
+
+    def create_module(self, spec):
+        if self.original_name is None:
+            return None
+        # The original module is imported as usual, so that the code of the library gets the original modules
+        module = importlib.import_module(self.original_name)
+        wrapped = self.import_hook.wrap_module(module=module, name=self.original_name)
+        if wrapped is module:
+            # Otherwise importlib would register the original module under the prefix and overwrite its spec
+            raise ImportError(f"module {self.original_name!r} is not wrapped", name=spec.name)
+        return wrapped
+
+    def exec_module(self, module):
+        # The proxy is complete when it is created
+        _ = module
+
+
+class WrappingImportHook:
+    """
+    Finder for `sys.meta_path`, which imports modules in the wrapping scope of the context wrapped under the prefix
+
+    `import <prefix>.<name>` imports the module `<name>` as usual and returns its proxy. The original modules stay in
+    `sys.modules` under their names, so that the code of the library, which imports its own modules, gets the original
+    ones, and only the importers, which use the prefix, get the proxies. Each module is wrapped once, on its first
+    import under the prefix. Modules, which are not wrapped (e.g. skipped), can't be imported under the prefix.
+    """
+
+    def __init__(self, context, prefix):
+        """
+        :param WrappingContext context: Wrapping session to wrap modules in, modules are wrapped if their names are in \
+        its wrapping scope
+        :param str prefix: Name of the package, which the wrapped modules are imported from
+        """
+        self.context = context
+        self.prefix = prefix
+
+    def install(self):
+        """Insert the hook at the beginning of `sys.meta_path`, if it is not there"""
+        if self not in sys.meta_path:
+            sys.meta_path.insert(0, self)
+
+    def uninstall(self):
+        """Remove the hook from `sys.meta_path` (the modules, which are already imported, stay in `sys.modules`)"""
+        with suppress(ValueError):
+            sys.meta_path.remove(self)
+
+    def __enter__(self):
+        self.install()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.uninstall()
+
+    # noinspection PyUnusedLocal
+    def find_spec(self, fullname, path=None, target=None):
+        """
+        Return the spec of the proxy of the module, which name is `fullname` without the prefix
+
+        :return: Spec or None if `fullname` does not start with the prefix, or the module is not found or should not \
+        be wrapped
+        """
+        if fullname == self.prefix:
+            return ModuleSpec(name=fullname, loader=_WrappingLoader(import_hook=self), is_package=True)
+        if not fullname.startswith(f'{self.prefix}.'):
+            return None
+        original_name = fullname[len(self.prefix) + 1:]
+        if original_name not in self.context.wrapping_scope:
+            return None
+        module = sys.modules.get(original_name)
+        if module is not None:
+            is_package = hasattr(module, '__path__')
+        else:
+            try:
+                original_spec = importlib.util.find_spec(original_name)
+            except ModuleNotFoundError:
+                return None
+            if original_spec is None:
+                return None
+            is_package = original_spec.submodule_search_locations is not None
+        return ModuleSpec(name=fullname, loader=_WrappingLoader(import_hook=self, original_name=original_name),
+                          is_package=is_package)
+
+    # noinspection PyShadowingNames
+    def wrap_module(self, module, name):
+        """
+        Wrap the imported module
+
+        :param types.ModuleType module: Original module
+        :param str name: Name of the module
+        :return: Wrapped `module`, or `module` itself if it can not be wrapped
+        """
+        wrapped = module
+        # noinspection PyProtectedMember
+        with self.context._suppress(AttributeError, TypeError):
+            wrapped = self.context.wrap(obj=module, name=name)
+        return wrapped
+
+
+def install_import_hook(prefix, wrapping_scope_regex=None, wrapper=None, methods_to_add=(), skip=(),
+                        wrap_return_values=False, lazy=True, cache=None, context=None, instrument=None, report=None):
+    """
+    Wrap modules, which names match `wrapping_scope_regex`, as they are imported under `prefix`
+
+    `import <prefix>.<name>` returns the wrapped module `<name>` (see `WrappingImportHook`). Unlike `wrap`, the library
+    is not imported as a whole in advance: each module is wrapped once, on its first import, so importing and wrapping
+    is paid only for the modules, which are used.
+
+    :param str prefix: Name of the package, which the wrapped modules are imported from
+    :param Union[None, str, WrappingScope] wrapping_scope_regex: regex for names of modules that should be wrapped \
+    (or the scope itself)
+    :param bool lazy: If true, wrap attributes of modules and classes on first access, otherwise modules are wrapped \
+    recursively on import (which imports the submodules they reach)
+    :param Optional[WrappingContext] context: Wrapping session to wrap modules in, if passed, the other wrapping \
+    parameters are taken from the context
+    :return: Installed hook (call its `uninstall` method or use it as a context manager to stop wrapping imports)
+    :raise ValueError: If neither `wrapping_scope_regex` nor `context` is passed
+
+    The rest of the parameters are the same as in `wrap`.
+    """
+    if context is None:
+        if wrapping_scope_regex is None:
+            raise ValueError("wrapping_scope_regex or context must be passed")
+        context = WrappingContext(
+            wrapper=wrapper,
+            methods_to_add=methods_to_add,
+            skip=skip,
+            wrap_return_values=wrap_return_values,
+            wrapping_scope_regex=wrapping_scope_regex,
+            lazy=lazy,
+            cache=cache,
+            instrument=instrument,
+            report=report,
+        )
+    import_hook = WrappingImportHook(context=context, prefix=prefix)
+    import_hook.install()
+    return import_hook
@@ -1,4 +1,240 @@
-from typing import Any, Callable, Collection, Tuple
+from concurrent.futures import Executor
+from importlib.machinery import ModuleSpec
+from types import ModuleType
+from typing import Any, Callable, Collection, Dict, Hashable, Iterable, List, Mapping, NamedTuple, Optional, Sequence, \
+    Tuple, Union
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: Optional[int]
+    currsize: int
+
+
+class WrappedObjectsCache:
+    maxsize: Optional[int]
+
+    def __init__(self, maxsize: Optional[int] = None) -> None:
+        ...
+
+    def get(self, obj: Any, key: Hashable) -> Any:
+        ...
+
+    def set(self, obj: Any, key: Hashable, wrapped: Any) -> None:
+        ...
+
+    def setdefault(self, obj: Any, key: Hashable, wrapped: Any) -> Any:
+        ...
+
+    def clear(self) -> None:
+        ...
+
+    def cache_info(self) -> CacheInfo:
+        ...
+
+    def __len__(self) -> int:
+        ...
+
+
+class WrappingScope:
+    def __init__(self, regex: Optional[str] = None, top_level_names: Optional[Collection[str]] = None) -> None:
+        ...
+
+    def __contains__(self, module_name: str) -> bool:
+        ...
+
+
+class CallStatistics:
+    DEFAULT_BUCKETS: Tuple[float, ...]
+    buckets: Tuple[float, ...]
+
+    def __init__(self, buckets: Collection[float] = ...) -> None:
+        ...
+
+    def record(self, name: str, duration: float, exception: Optional[BaseException] = None) -> None:
+        ...
+
+    def clear(self) -> None:
+        ...
+
+    def as_dict(self) -> Dict[str, Dict[str, float]]:
+        ...
+
+    def to_prometheus(self, prefix: str = 'module_wrapper') -> str:
+        ...
+
+
+call_statistics: CallStatistics
+
+
+class WrapReport:
+    COUNTERS: Tuple[str, ...]
+    counters: Dict[str, int]
+    suppressed_exceptions_by_type: Dict[str, int]
+    module_seconds: Dict[str, float]
+
+    def __init__(self) -> None:
+        ...
+
+    def count(self, counter: str, value: int = 1) -> None:
+        ...
+
+    def record_exception(self, exception: BaseException) -> None:
+        ...
+
+    def record_module_time(self, module_name: str, seconds: float) -> None:
+        ...
+
+    def as_dict(self) -> Dict[str, Any]:
+        ...
+
+
+class ExecutorWrapper:
+    THREAD: str
+    PROCESS: str
+    INLINE: str
+    ROUTES: Tuple[str, ...]
+    INLINE_SAMPLES: int
+    max_workers: Optional[int]
+    max_process_workers: Optional[int]
+    max_concurrency: Optional[int]
+    routes: Tuple[Tuple[Any, str], ...]
+    default_route: str
+    inline_threshold: Optional[float]
+
+    def __init__(self,
+                 max_workers: int = None,
+                 max_process_workers: int = None,
+                 max_concurrency: int = None,
+                 routes: Union[Mapping[Any, str], Iterable[Tuple[Any, str]]] = (),
+                 default_route: str = ...,
+                 inline_threshold: float = None,
+                 thread_executor: Executor = None,
+                 process_executor: Executor = None) -> None:
+        ...
+
+    def get_route(self, func: Callable) -> str:
+        ...
+
+    def shutdown(self, wait: bool = True) -> None:
+        ...
+
+    def __call__(self, func: Callable) -> Callable:
+        ...
+
+
+class BatchingWrapper:
+    bulk_hooks: Tuple[Callable[[Callable], Optional[Callable]], ...]
+    max_batch_size: int
+    window: float
+    wrapper: Optional[Callable[[Callable], Callable]]
+
+    def __init__(self,
+                 bulk_hooks: Collection[Callable[[Callable], Optional[Callable]]] = (),
+                 max_batch_size: int = 64,
+                 window: float = 0.001,
+                 wrapper: Callable[[Callable], Callable] = None) -> None:
+        ...
+
+    def get_bulk_implementation(self, func: Callable) -> Optional[Callable]:
+        ...
+
+    def __call__(self, func: Callable) -> Callable:
+        ...
+
+
+class MemoizingWrapper:
+    patterns: Tuple[Any, ...]
+    maxsize: Optional[int]
+    ttl: Optional[float]
+    wrapper: Optional[Callable[[Callable], Callable]]
+
+    def __init__(self,
+                 patterns: Collection[Any] = (),
+                 maxsize: Optional[int] = 128,
+                 ttl: float = None,
+                 wrapper: Callable[[Callable], Callable] = None) -> None:
+        ...
+
+    def is_memoized(self, func: Callable) -> bool:
+        ...
+
+    def clear(self) -> None:
+        ...
+
+    def cache_info(self) -> CacheInfo:
+        ...
+
+    def __call__(self, func: Callable) -> Callable:
+        ...
+
+
+class WrappingContext:
+    wrapper: Optional[Callable[[Callable], Callable]]
+    methods_to_add: Collection[Callable[[Callable], Tuple[str, Callable]]]
+    skip: Collection[Any]
+    wrap_return_values: bool
+    wrapped_name_func: Callable[[Any], str]
+    wrapping_scope: WrappingScope
+    lazy: bool
+    cache: WrappedObjectsCache
+    workers: Optional[int]
+    instrument: Optional[CallStatistics]
+    report: Optional[WrapReport]
+
+    def __init__(self,
+                 wrapper: Callable[[Callable], Callable] = None,
+                 methods_to_add: Collection[Callable[[Callable], Tuple[str, Callable]]] = (),
+                 skip: Collection[Any] = (),
+                 wrap_return_values: bool = False,
+                 wrapped_name_func: Callable[[Any], str] = None,
+                 wrapping_scope_regex: Union[None, str, WrappingScope] = None,
+                 lazy: bool = False,
+                 cache: WrappedObjectsCache = None,
+                 workers: int = None,
+                 instrument: Union[None, bool, CallStatistics] = None,
+                 report: WrapReport = None) -> None:
+        ...
+
+    def wrap(self, obj: Any, name: str = None, wrapped: Any = None) -> Any:
+        ...
+
+    def wrap_many(self, objs: Iterable[Any], names: Optional[Iterable[Optional[str]]] = None) -> List[Any]:
+        ...
+
+    def clear(self) -> None:
+        ...
+
+    def cache_info(self) -> CacheInfo:
+        ...
+
+
+class WrappingImportHook:
+    context: WrappingContext
+    prefix: str
+
+    def __init__(self, context: WrappingContext, prefix: str) -> None:
+        ...
+
+    def install(self) -> None:
+        ...
+
+    def uninstall(self) -> None:
+        ...
+
+    def __enter__(self) -> 'WrappingImportHook':
+        ...
+
+    def __exit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
+        ...
+
+    def find_spec(self, fullname: str, path: Optional[Sequence[str]] = None, target: Optional[ModuleType] = None) \
+            -> Optional[ModuleSpec]:
+        ...
+
+    def wrap_module(self, module: ModuleType, name: str) -> Any:
+        ...
 
 
 def wrap(obj: Any,
@@ -7,5 +243,43 @@ def wrap(obj: Any,
          name: str = None,
          skip: Collection[str] = (),
          wrap_return_values: bool = False,
-         clear_cache: bool = True) -> Any:
+         clear_cache: bool = True,
+         wrapping_scope_regex: str = None,
+         lazy: bool = False,
+         cache: WrappedObjectsCache = None,
+         context: WrappingContext = None,
+         workers: int = None,
+         instrument: Union[None, bool, CallStatistics] = None,
+         report: WrapReport = None) -> Any:
+    ...
+
+
+def wrap_many(objs: Iterable[Any],
+              wrapper: Callable[[Callable], Callable] = None,
+              methods_to_add: Collection[Callable[[Callable], Tuple[str, Callable]]] = (),
+              names: Optional[Iterable[Optional[str]]] = None,
+              skip: Collection[str] = (),
+              wrap_return_values: bool = False,
+              clear_cache: bool = True,
+              wrapping_scope_regex: str = None,
+              lazy: bool = False,
+              cache: WrappedObjectsCache = None,
+              context: WrappingContext = None,
+              workers: int = None,
+              instrument: Union[None, bool, CallStatistics] = None,
+              report: WrapReport = None) -> List[Any]:
+    ...
+
+
+def install_import_hook(prefix: str,
+                        wrapping_scope_regex: Union[None, str, WrappingScope] = None,
+                        wrapper: Callable[[Callable], Callable] = None,
+                        methods_to_add: Collection[Callable[[Callable], Tuple[str, Callable]]] = (),
+                        skip: Collection[str] = (),
+                        wrap_return_values: bool = False,
+                        lazy: bool = True,
+                        cache: WrappedObjectsCache = None,
+                        context: WrappingContext = None,
+                        instrument: Union[None, bool, CallStatistics] = None,
+                        report: WrapReport = None) -> WrappingImportHook:
     ...
@@ -0,0 +1,46 @@
+import sys
+import textwrap
+import types
+
+import pytest
+
+
+@pytest.fixture
+def make_module():
+    """Return a function, which creates a module from source and registers it in `sys.modules` for the test"""
+    names = []
+
+    def make(name, source=''):
+        module = types.ModuleType(name)
+        module.__file__ = f'<{name}>'
+        sys.modules[name] = module
+        names.append(name)
+        exec(compile(textwrap.dedent(source), module.__file__, 'exec'), module.__dict__)
+        parent_name, _, child_name = name.rpartition('.')
+        if parent_name in sys.modules:
+            setattr(sys.modules[parent_name], child_name, module)
+        return module
+
+    yield make
+    for name in names:
+        sys.modules.pop(name, None)
+
+
+@pytest.fixture
+def make_package(tmp_path, monkeypatch):
+    """Return a function, which writes a package to a temporary directory, which is on `sys.path` for the test"""
+    monkeypatch.syspath_prepend(str(tmp_path))
+    names = []
+
+    def make(name, modules):
+        package_path = tmp_path / name
+        package_path.mkdir()
+        names.append(name)
+        for module_name, source in modules.items():
+            (package_path / f'{module_name}.py').write_text(textwrap.dedent(source))
+        return package_path
+
+    yield make
+    for module_name in list(sys.modules):
+        if any(module_name == name or module_name.startswith(f'{name}.') for name in names):
+            del sys.modules[module_name]
@@ -0,0 +1,828 @@
+import threading
+import time
+
+import pytest
+
+import module_wrapper
+
+
+def test_stdlib_module_names_regex_is_memoized():
+    regex = module_wrapper.STDLIB_MODULE_NAMES_REGEX
+    assert module_wrapper.STDLIB_MODULE_NAMES_REGEX is regex
+    assert 'asyncio' in regex
+
+
+def test_stdlib_module_names_without_module_getattr(monkeypatch):
+    import importlib.util
+    import sys
+
+    monkeypatch.setattr(sys, 'version_info', (3, 6, 15, 'final', 0))
+    spec = importlib.util.spec_from_file_location('module_wrapper_3_6', module_wrapper.__file__)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    # Python 3.6 ignores module `__getattr__`, so the names must be in the dict of the module
+    assert 'asyncio' in vars(module)['STDLIB_MODULE_NAMES']
+    assert 'asyncio' in vars(module)['STDLIB_MODULE_NAMES_REGEX']
+
+
+def _identity_wrapper(func):
+    return func
+
+
+def test_wrap_keeps_cache_passed_by_caller(make_module):
+    module = make_module('cached_module', '''
+        class A:
+            def method(self):
+                return 1
+
+
+        def function():
+            return 2
+    ''')
+    cache = module_wrapper.WrappedObjectsCache(maxsize=100)
+    wrapped = module_wrapper.wrap(obj=module, wrapper=_identity_wrapper, cache=cache)
+    assert len(cache) > 0
+    assert module_wrapper.wrap(obj=module, wrapper=_identity_wrapper, cache=cache) is wrapped
+    assert cache.cache_info().hits == 1
+    assert module_wrapper.wrap_many(objs=[module], wrapper=_identity_wrapper, cache=cache) == [wrapped]
+    assert len(cache) > 0
+
+
+def _run_in_thread(func, timeout=10.0):
+    results = []
+    thread = threading.Thread(target=lambda: results.append(func()), daemon=True)
+    thread.start()
+    thread.join(timeout)
+    assert not thread.is_alive(), "timed out"
+    return results[0]
+
+
+def test_wrap_with_workers_wraps_nested_instances(make_module):
+    module = make_module('nested_instances_module', '''
+        class B:
+            pass
+
+
+        class Holder:
+            class First:
+                b = B()
+
+            class Second:
+                b = B()
+
+
+        holder = Holder()
+    ''')
+    wrapped = _run_in_thread(lambda: module_wrapper.wrap(obj=module, wrapper=_identity_wrapper, workers=4))
+    assert isinstance(wrapped.holder.First.b, module_wrapper.ObjectProxy)
+    assert isinstance(wrapped.holder.Second.b, module_wrapper.ObjectProxy)
+
+
+def test_concurrent_wrap_returns_finished_proxy(make_module):
+    module = make_module('concurrent_module', '''
+        def first():
+            return 1
+
+
+        def second():
+            return 2
+
+
+        class A:
+            def method(self):
+                return 3
+    ''')
+    is_wrapping = threading.Event()
+
+    def slow_wrapper(func):
+        if not is_wrapping.is_set():
+            is_wrapping.set()
+            time.sleep(0.2)
+        return func
+
+    context = module_wrapper.WrappingContext(wrapper=slow_wrapper, wrapping_scope_regex='concurrent_module')
+    first_thread = threading.Thread(target=context.wrap, kwargs={'obj': module})
+    first_thread.start()
+    is_wrapping.wait()
+    wrapped = _run_in_thread(lambda: context.wrap(obj=module))
+    assert {'first', 'second', 'A'} <= set(vars(wrapped))
+    first_thread.join()
+    assert context.wrap(obj=module) is wrapped
+
+
+def test_wrap_self_referencing_class(make_module):
+    module = make_module('self_referencing_module', '''
+        class A:
+            pass
+
+
+        A.self = A
+    ''')
+    wrapped = module_wrapper.wrap(obj=module, wrapper=_identity_wrapper)
+    assert wrapped.A.self is wrapped.A
+
+
+def test_new_instances_are_cached_only_with_wrap_return_values(make_module):
+    module = make_module('instances_module', '''
+        class A:
+            def __init__(self, value):
+                self.value = value
+
+            def get_self(self):
+                return self
+    ''')
+    context = module_wrapper.WrappingContext(wrapper=_identity_wrapper, wrapping_scope_regex='instances_module')
+    wrapped = context.wrap(obj=module)
+    cache_size = len(context.cache)
+    instance = wrapped.A(1)
+    assert len(context.cache) == cache_size
+    assert object.__getattribute__(instance, '_original_obj').value == 1
+    assert instance.value == 1
+
+    context = module_wrapper.WrappingContext(wrapper=_identity_wrapper, wrapping_scope_regex='instances_module',
+                                             wrap_return_values=True)
+    instance = context.wrap(obj=module).A(1)
+    assert instance.get_self() is instance
+
+
+def test_new_instances_get_original_obj_by_wrapped_name_func(make_module):
+    module = make_module('named_instances_module', '''
+        class A:
+            pass
+    ''')
+    wrapped = module_wrapper.WrappingContext(wrapper=_identity_wrapper, wrapped_name_func=lambda obj: 'original',
+                                             wrapping_scope_regex='named_instances_module').wrap(obj=module)
+    instance = wrapped.A()
+    original = object.__getattribute__(instance, 'original')
+    assert isinstance(original, module.A)
+    assert object.__getattribute__(instance, '_original_obj') is original
+
+
+def test_instance_proxy_holds_only_original_obj(make_module):
+    module = make_module('slotted_instances_module', '''
+        class A:
+            pass
+    ''')
+    context = module_wrapper.WrappingContext(wrapper=_identity_wrapper,
+                                             wrapping_scope_regex='slotted_instances_module')
+    wrapped_class = context.wrap(obj=module).A
+    cache_size = len(context.cache)
+    instances = [wrapped_class() for _ in range(10)]
+    assert len(context.cache) == cache_size
+    for instance in instances:
+        with pytest.raises(AttributeError):
+            object.__getattribute__(instance, '__dict__')
+        assert type(object.__getattribute__(instance, '_original_obj')) is module.A
+
+
+def test_attribute_reads_of_instance_proxies(make_module):
+    module = make_module('attributes_module', '''
+        class B:
+            pass
+
+
+        class A:
+            calls = 0
+
+            def __init__(self):
+                self.b = B()
+
+            @property
+            def broken(self):
+                type(self).calls += 1
+                raise TypeError("broken")
+    ''')
+    instance = module_wrapper.wrap(obj=module, wrapper=_identity_wrapper).A()
+    b = instance.b
+    assert isinstance(b, module_wrapper.ObjectProxy)
+    assert instance.b is b
+    instance.b = module.B()
+    assert instance.b is not b
+    assert type(instance.__dict__) is dict
+    with pytest.raises(TypeError):
+        _ = instance.broken
+    assert module.A.calls == 1
+
+
+def test_collecting_proxy_does_not_finalize_original(make_module):
+    import gc
+
+    module = make_module('finalized_module', '''
+        finalized = []
+
+
+        class A:
+            def __del__(self):
+                finalized.append(self)
+    ''')
+    context = module_wrapper.WrappingContext(wrapper=_identity_wrapper, wrapping_scope_regex='finalized_module')
+    context.wrap(obj=module)
+    original = module.A()
+    proxy = context.wrap(obj=original, name='original')
+    assert isinstance(proxy, module_wrapper.ObjectProxy)
+    del proxy
+    gc.collect()
+    assert module.finalized == []
+    del original
+    assert len(module.finalized) == 1
+
+
+def test_wrap_unhashable_return_values(make_module):
+    module = make_module('unhashable_module', '''
+        class Point:
+            __slots__ = ('x', )
+
+            def __init__(self, x):
+                self.x = x
+
+            def __eq__(self, other):
+                return isinstance(other, Point) and self.x == other.x
+
+
+        def make_point(x):
+            return Point(x)
+    ''')
+    wrapped = module_wrapper.wrap(obj=module, wrapper=_identity_wrapper, wrap_return_values=True)
+    point = wrapped.make_point(1)
+    assert isinstance(point, module_wrapper.ObjectProxy)
+    assert point.x == 1
+
+
+def test_protocol_results_of_magic_methods_are_not_wrapped(make_module):
+    module = make_module('protocol_module', '''
+        class A:
+            def __init__(self, value):
+                self.value = value
+
+            def __str__(self):
+                return str(self.value)
+
+            def __len__(self):
+                return self.value
+
+            def __eq__(self, other):
+                return NotImplemented
+    ''')
+    context = module_wrapper.WrappingContext(wrapper=_identity_wrapper, wrap_return_values=True,
+                                             wrapping_scope_regex='.*')
+    instance = context.wrap(obj=module).A(2)
+    assert str(instance) == '2'
+    assert len(instance) == 2
+    assert instance != 1
+
+
+def test_wrapping_abstract_classes_keeps_isinstance_working(make_module):
+    module = make_module('abstract_module', '''
+        import abc
+
+
+        class Base(abc.ABC):
+            @abc.abstractmethod
+            def method(self):
+                pass
+
+
+        class Implementation(Base):
+            def method(self):
+                return 1
+    ''')
+    # The state of abstract classes is an object of the standard library
+    wrapped = module_wrapper.wrap(obj=module, wrapper=_identity_wrapper, wrapping_scope_regex='.*')
+    assert not isinstance(object(), module.Base)
+    assert isinstance(module.Implementation(), module.Base)
+    assert wrapped.Implementation().method() == 1
+
+
+def test_memoizing_wrapper_shares_calls_per_event_loop(make_module):
+    import asyncio
+
+    module = make_module('memoized_module', '''
+        import asyncio
+
+        calls = []
+
+
+        async def fetch(n):
+            calls.append(n)
+            await asyncio.sleep(0.05)
+            return n * 2
+    ''')
+    memoizing_wrapper = module_wrapper.MemoizingWrapper(patterns=['fetch'])
+    fetch = module_wrapper.wrap(obj=module, wrapper=memoizing_wrapper).fetch
+
+    async def fetch_concurrently():
+        first = asyncio.ensure_future(fetch(1))
+        second = asyncio.ensure_future(fetch(1))
+        await asyncio.sleep(0)
+        first.cancel()
+        return await second
+
+    assert asyncio.run(fetch_concurrently()) == 2
+    assert module.calls == [1]
+    assert memoizing_wrapper.cache_info().hits == 1
+
+    memoizing_wrapper.clear()
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(asyncio.run(fetch(2)))) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == [4, 4]
+
+
+def _async_wrapper(func):
+    import asyncio
+    from functools import wraps
+
+    @wraps(func)
+    async def run(*args, **kwargs):
+        return await asyncio.get_event_loop().run_in_executor(None, lambda: func(*args, **kwargs))
+
+    return run
+
+
+def test_import_hook_leaves_original_modules_to_the_library(make_package):
+    import asyncio
+    import importlib
+    import sys
+
+    make_package('hooked_package', {
+        '__init__': '',
+        'a': '''
+            def fa():
+                return 'a'
+        ''',
+        'b': '''
+            from hooked_package.a import fa
+
+
+            def fb():
+                return fa() + 'b'
+        ''',
+    })
+    try:
+        with module_wrapper.install_import_hook(prefix='wrapped_hooked',
+                                               wrapping_scope_regex=r'hooked_package(\..*)?', wrapper=_async_wrapper):
+            wrapped_b = importlib.import_module('wrapped_hooked.hooked_package.b')
+            from wrapped_hooked.hooked_package.a import fa as wrapped_fa
+            with pytest.raises(ImportError):
+                importlib.import_module('wrapped_hooked.json')
+        assert asyncio.run(wrapped_b.fb()) == 'ab'
+        assert asyncio.run(wrapped_fa()) == 'a'
+        assert sys.modules['hooked_package.b'].fb() == 'ab'
+        assert not isinstance(sys.modules['hooked_package.b'], module_wrapper.ModuleProxy)
+        assert isinstance(sys.modules['wrapped_hooked.hooked_package.b'], module_wrapper.ModuleProxy)
+    finally:
+        for module_name in list(sys.modules):
+            if module_name.partition('.')[0] == 'wrapped_hooked':
+                del sys.modules[module_name]
+
+
+def _aioify(obj, name=None):
+    # The example from README.md
+    import asyncio
+    from functools import partial, wraps
+
+    def wrap(func):
+        @wraps(func)
+        async def run(*args, loop=None, executor=None, **kwargs):
+            if loop is None:
+                loop = asyncio.get_event_loop()
+            pfunc = partial(func, *args, **kwargs)
+            return await loop.run_in_executor(executor, pfunc)
+        return run
+
+    def create(cls):
+        return 'create', wrap(cls)
+
+    return module_wrapper.wrap(obj=obj, wrapper=wrap, methods_to_add={create}, name=name)
+
+
+def test_methods_to_add_are_not_set_on_originals(make_module):
+    import asyncio
+    import fractions
+
+    module = make_module('aioified_module', '''
+        class Slotted:
+            __slots__ = ('value', )
+
+            def __init__(self, value):
+                self.value = value
+
+            def get(self):
+                return self.value
+
+
+        class Plain:
+            pass
+
+
+        plain = Plain()
+    ''')
+    wrapped = _aioify(module)
+    assert asyncio.run(wrapped.Slotted(1).get()) == 1
+    assert vars(module.plain) == {}
+
+    async def create():
+        return await (await wrapped.Slotted.create(2)).get()
+
+    assert asyncio.run(create()) == 2
+    assert _aioify(fractions).Fraction(1, 3) == fractions.Fraction(1, 3)
+
+
+def test_import_hook_does_not_import_unwrapped_modules_under_prefix(make_package):
+    import importlib
+    import sys
+
+    make_package('skipped_package', {
+        '__init__': '',
+        'a': '''
+            def fa():
+                return 'a'
+        ''',
+    })
+    try:
+        with module_wrapper.install_import_hook(prefix='wrapped_skipped',
+                                               wrapping_scope_regex=r'skipped_package(\..*)?',
+                                               skip=['skipped_package.a']):
+            with pytest.raises(ImportError):
+                importlib.import_module('wrapped_skipped.skipped_package.a')
+        assert 'wrapped_skipped.skipped_package.a' not in sys.modules
+        assert sys.modules['skipped_package.a'].__spec__.name == 'skipped_package.a'
+    finally:
+        for module_name in list(sys.modules):
+            if module_name.partition('.')[0] == 'wrapped_skipped':
+                del sys.modules[module_name]
+
+
+def test_wrap_with_workers_without_pool_initializers(make_module, monkeypatch):
+    import concurrent.futures
+
+    class ThreadPoolExecutor(concurrent.futures.ThreadPoolExecutor):
+        # The signature of Python 3.6
+        def __init__(self, max_workers=None, thread_name_prefix=''):
+            super().__init__(max_workers=max_workers, thread_name_prefix=thread_name_prefix)
+
+    monkeypatch.setattr(concurrent.futures, 'ThreadPoolExecutor', ThreadPoolExecutor)
+    module = make_module('pooled_module', '''
+        class A:
+            class B:
+                pass
+
+            b = B()
+
+
+        class C:
+            pass
+    ''')
+    wrapped = _run_in_thread(lambda: module_wrapper.wrap(obj=module, wrapper=_identity_wrapper, workers=2))
+    assert isinstance(wrapped.A.b, module_wrapper.ObjectProxy)
+    assert issubclass(wrapped.C, module.C)
+
+
+def test_instrumented_calls_are_aggregated_when_read(make_module):
+    module = make_module('instrumented_module', '''
+        def succeed():
+            return 1
+
+
+        def fail():
+            raise ValueError
+    ''')
+    statistics = module_wrapper.CallStatistics()
+    wrapped = module_wrapper.wrap(obj=module, wrapper=_identity_wrapper, instrument=statistics)
+    for _ in range(3):
+        assert wrapped.succeed() == 1
+    with pytest.raises(ValueError):
+        wrapped.fail()
+    statistics.record(name='instrumented_module.fail', duration=0.5, exception=ValueError())
+    result = statistics.as_dict()
+    assert result['instrumented_module.succeed']['count'] == 3
+    assert result['instrumented_module.succeed']['exceptions'] == 0
+    assert result['instrumented_module.fail']['count'] == 2
+    assert result['instrumented_module.fail']['exceptions'] == 2
+    assert result['instrumented_module.fail']['max_seconds'] == 0.5
+    assert statistics.as_dict() == result
+    statistics.clear()
+    assert statistics.as_dict() == {}
+
+
+def test_executor_wrapper_routes_limits_and_inlines_calls(make_module):
+    import asyncio
+    from concurrent.futures import ThreadPoolExecutor
+
+    module = make_module('executed_module', '''
+        import threading
+        import time
+
+        lock = threading.Lock()
+        running = 0
+        max_running = 0
+
+
+        def blocking():
+            global running, max_running
+            with lock:
+                running += 1
+                max_running = max(max_running, running)
+            time.sleep(0.02)
+            with lock:
+                running -= 1
+            return threading.current_thread().name
+
+
+        def cheap():
+            return threading.current_thread().name
+
+
+        def inlined():
+            return threading.current_thread().name
+
+
+        async def coroutine_function():
+            return 1
+    ''')
+    with pytest.raises(ValueError):
+        module_wrapper.ExecutorWrapper(routes={'*': 'fiber'})
+    executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='executed')
+    executor_wrapper = module_wrapper.ExecutorWrapper(max_concurrency=2, routes={'*.inlined': 'inline'},
+                                                      inline_threshold=1.0, thread_executor=executor)
+    assert executor_wrapper.get_route(module.inlined) == executor_wrapper.INLINE
+    assert executor_wrapper.get_route(module.blocking) == executor_wrapper.THREAD
+    assert executor_wrapper(module.coroutine_function) is module.coroutine_function
+    wrapped = module_wrapper.wrap(obj=module, wrapper=executor_wrapper)
+
+    async def call():
+        blocking_names = await asyncio.gather(*[wrapped.blocking() for _ in range(6)])
+        cheap_names = [await wrapped.cheap() for _ in range(executor_wrapper.INLINE_SAMPLES + 1)]
+        return blocking_names, cheap_names, await wrapped.inlined()
+
+    try:
+        blocking_names, cheap_names, inlined_name = asyncio.run(call())
+    finally:
+        executor_wrapper.shutdown()
+        executor.shutdown()
+    main_thread_name = threading.current_thread().name
+    assert all(name.startswith('executed') for name in blocking_names)
+    assert module.max_running == 2
+    # The first calls are sampled in the executor, the next ones are cheap enough to be called inline
+    assert all(name.startswith('executed') for name in cheap_names[:-1])
+    assert cheap_names[-1] == main_thread_name
+    assert inlined_name == main_thread_name
+
+
+def test_batching_wrapper_coalesces_calls(make_module):
+    import asyncio
+
+    module = make_module('batched_module', '''
+        batches = []
+
+
+        def get(key):
+            return key * 2
+
+
+        def get_many(calls):
+            batches.append([args[0] for args, kwargs in calls])
+            return [KeyError(args[0]) if args[0] < 0 else args[0] * 2 for args, kwargs in calls]
+
+
+        def broken_get(key):
+            return key
+
+
+        def broken_get_many(calls):
+            return []
+
+
+        def unbatched():
+            return 1
+    ''')
+    bulk_implementations = {module.get: module.get_many, module.broken_get: module.broken_get_many}
+    with pytest.raises(ValueError):
+        module_wrapper.BatchingWrapper(max_batch_size=0)
+    batching_wrapper = module_wrapper.BatchingWrapper(bulk_hooks=[bulk_implementations.get], max_batch_size=3,
+                                                      window=0.01)
+    assert batching_wrapper(module.unbatched) is module.unbatched
+    wrapped = module_wrapper.wrap(obj=module, wrapper=batching_wrapper)
+
+    async def call():
+        results = await asyncio.gather(*[wrapped.get(key) for key in [1, 2, -3, 4, 5]], return_exceptions=True)
+        # Calls made after the window are passed in the next batch
+        await asyncio.sleep(0.02)
+        results.append(await wrapped.get(6))
+        broken_results = await asyncio.gather(wrapped.broken_get(1), wrapped.broken_get(2), return_exceptions=True)
+        return results, broken_results
+
+    results, broken_results = asyncio.run(call())
+    assert module.batches == [[1, 2, -3], [4, 5], [6]]
+    assert results[:2] == [2, 4] and results[3:] == [8, 10, 12]
+    # Exceptions are raised only to their callers
+    assert isinstance(results[2], KeyError)
+    assert all(isinstance(result, ValueError) for result in broken_results)
+
+
+def test_call_statistics_output():
+    statistics = module_wrapper.CallStatistics(buckets=[1.0, 0.1])
+    for duration in [0.05, 0.05, 0.5]:
+        statistics.record(name='module.function', duration=duration)
+    statistics.record(name='module.function', duration=2.0, exception=ValueError())
+    statistics.record(name='module."quoted"', duration=0.25)
+    assert statistics.as_dict()['module.function'] == {
+        'count': 4,
+        'exceptions': 1,
+        'total_seconds': pytest.approx(2.6),
+        'mean_seconds': pytest.approx(0.65),
+        'max_seconds': 2.0,
+        'p50_seconds': 0.1,
+        'p90_seconds': 2.0,
+        'p99_seconds': 2.0,
+    }
+    assert statistics.as_dict()['module."quoted"']['p50_seconds'] == 0.25
+    assert statistics.to_prometheus(prefix='calls') == '''\
+# HELP calls_calls_total Number of calls of wrapped functions
+# TYPE calls_calls_total counter
+calls_calls_total{function="module.\\"quoted\\""} 1
+calls_calls_total{function="module.function"} 4
+# HELP calls_exceptions_total Number of calls of wrapped functions, which raised exceptions
+# TYPE calls_exceptions_total counter
+calls_exceptions_total{function="module.\\"quoted\\""} 0
+calls_exceptions_total{function="module.function"} 1
+# HELP calls_call_duration_seconds Durations of calls of wrapped functions
+# TYPE calls_call_duration_seconds histogram
+calls_call_duration_seconds_bucket{function="module.\\"quoted\\"",le="0.1"} 0
+calls_call_duration_seconds_bucket{function="module.\\"quoted\\"",le="1.0"} 1
+calls_call_duration_seconds_bucket{function="module.\\"quoted\\"",le="+Inf"} 1
+calls_call_duration_seconds_sum{function="module.\\"quoted\\""} 0.25
+calls_call_duration_seconds_count{function="module.\\"quoted\\""} 1
+calls_call_duration_seconds_bucket{function="module.function",le="0.1"} 2
+calls_call_duration_seconds_bucket{function="module.function",le="1.0"} 3
+calls_call_duration_seconds_bucket{function="module.function",le="+Inf"} 4
+calls_call_duration_seconds_sum{function="module.function"} 2.6
+calls_call_duration_seconds_count{function="module.function"} 4
+'''
+
+
+def test_lazy_mode_wraps_attributes_on_first_access(make_module):
+    module = make_module('lazy_module', '''
+        def function():
+            return 1
+
+
+        class A:
+            def __getitem__(self, key):
+                return key
+
+            def method(self):
+                return 3
+
+            @classmethod
+            def class_method(cls):
+                return cls
+    ''')
+    wrapped_names = []
+
+    def wrapper(func):
+        wrapped_names.append(func.__qualname__)
+        return func
+
+    wrapped = module_wrapper.wrap(obj=module, wrapper=wrapper, lazy=True)
+    assert isinstance(wrapped, module_wrapper.LazyModuleProxy)
+    assert wrapped_names == []
+    assert 'function' in dir(wrapped)
+    with pytest.raises(AttributeError):
+        wrapped.missing
+    assert wrapped.function() == 1
+    assert wrapped.function is wrapped.function
+    assert wrapped_names == ['function']
+
+    # Magic methods are wrapped right away, since the interpreter doesn't look them up through descriptors
+    wrapped_class = wrapped.A
+    assert not isinstance(vars(wrapped_class)['__getitem__'], module_wrapper.LazyAttribute)
+    assert isinstance(vars(wrapped_class)['method'], module_wrapper.LazyAttribute)
+    assert wrapped_class.method(module.A()) == 3
+    assert not isinstance(vars(wrapped_class)['method'], module_wrapper.LazyAttribute)
+    # Class methods are bound to the original class, as in the eager mode
+    assert wrapped_class.class_method() is module.A
+    assert wrapped_names == ['function', 'A.method', 'A.class_method']
+    assert wrapped_class()[2] == 2
+
+
+def test_items_of_returned_iterators_are_wrapped(make_module):
+    import asyncio
+
+    module = make_module('iterated_module', '''
+        class Item:
+            def __init__(self, value):
+                self.value = value
+
+
+        def generate():
+            yield Item(1)
+            sent = yield 2
+            yield Item(sent)
+
+
+        async def generate_async():
+            yield Item(1)
+            sent = yield 2
+            yield Item(sent)
+    ''')
+    wrapped = module_wrapper.wrap(obj=module, wrapper=_identity_wrapper, wrap_return_values=True)
+    iterator = wrapped.generate()
+    assert isinstance(iterator, module_wrapper.IteratorProxy)
+    assert iter(iterator) is iterator
+    assert iterator.gi_frame is not None
+    first = next(iterator)
+    assert isinstance(first, module_wrapper.ObjectProxy) and first.value == 1
+    assert next(iterator) == 2
+    last = iterator.send(3)
+    assert isinstance(last, module_wrapper.ObjectProxy) and last.value == 3
+    iterator.close()
+    assert iterator.gi_frame is None
+
+    async def iterate():
+        async_iterator = wrapped.generate_async()
+        assert isinstance(async_iterator, module_wrapper.AsyncIteratorProxy)
+        assert async_iterator.__aiter__() is async_iterator
+        items = [await async_iterator.__anext__(), await async_iterator.__anext__(), await async_iterator.asend(3)]
+        await async_iterator.aclose()
+        return items
+
+    first, second, last = asyncio.run(iterate())
+    assert isinstance(first, module_wrapper.ObjectProxy) and first.value == 1
+    assert second == 2
+    assert isinstance(last, module_wrapper.ObjectProxy) and last.value == 3
+
+
+def _normalize_member_value(value):
+    # Exceptions raised by getattr are new objects on every lookup
+    if isinstance(value, tuple) and value[:1] == (module_wrapper.RAISES_EXCEPTION, ):
+        return module_wrapper.RAISES_EXCEPTION, type(value[1])
+    return value
+
+
+def _normalize_members(members):
+    return {key: _normalize_member_value(value) for key, value in members}
+
+
+def test_iter_members_matches_generic_lookup(make_module):
+    module = make_module('members_module', '''
+        import enum
+        import types
+
+
+        class Raising:
+            def __get__(self, instance, owner):
+                raise ValueError
+
+
+        class Meta(type):
+            @property
+            def meta_property(cls):
+                return 1
+
+
+        class Base(metaclass=Meta):
+            __slots__ = ('slot', )
+
+            base_attribute = 1
+            raising = Raising()
+
+            def method(self):
+                pass
+
+            @classmethod
+            def class_method(cls):
+                pass
+
+            @staticmethod
+            def static_method():
+                pass
+
+            @property
+            def property(self):
+                pass
+
+            @types.DynamicClassAttribute
+            def dynamic(self):
+                pass
+
+
+        class Derived(Base):
+            base_attribute = 2
+
+            def method(self):
+                pass
+
+
+        class Color(enum.Enum):
+            RED = 1
+    ''')
+    for obj in [module, module.Base, module.Derived, module.Color]:
+        assert (_normalize_members(module_wrapper.iter_members(obj)) ==
+                _normalize_members(module_wrapper._iter_members_generic(obj))), obj
+    members = _normalize_members(module_wrapper.iter_members(module.Derived))
+    assert members['raising'] == (module_wrapper.RAISES_EXCEPTION, ValueError)
+    assert members['base_attribute'] == 2